@@ -12,6 +12,8 @@ import math
 # import pyperf
 from time import perf_counter
 
+ROWS = 400000
+
 
 class AvgLength(object):
 
@@ -57,4 +59,4 @@ if __name__ == "__main__":
     # runner = pyperf.Runner()
     # runner.metadata["description"] = "Benchmark Python aggregate for SQLite"
     # runner.bench_time_func("sqlite_synth", bench_sqlite)
-    bench_sqlite(400000)
\ No newline at end of file
+    bench_sqlite(ROWS)
\ No newline at end of file
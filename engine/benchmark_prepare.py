@@ -10,6 +10,89 @@ mapping = {
     "bm_telco": {},
 }
 
+# Benchmarks with a data size, by the name of the integer it is assigned to,
+# either at module level or in the ``__main__`` block. Most benchmarks only
+# take the pyperf ``loops`` repeat count, which says nothing about how the
+# speedup changes with the size of the data, so they have no entry here.
+# Sizes with exponential cost, like fannkuch's permutation length or the
+# number of queens, are left out as well, since no sweep of them finishes.
+size_parameters = {
+    "bm_crypto_pyaes": "CLEARTEXT",
+    "bm_deltablue": "n",
+    "bm_float": "POINTS",
+    "bm_gc_collect": "CYCLES",
+    "bm_gc_traversal": "N_LEVELS",
+    "bm_pathlib": "NUM_FILES",
+    "bm_pidigits": "DEFAULT_DIGITS",
+    "bm_regex_dna": "DEFAULT_INIT_LEN",
+    "bm_spectral_norm": "DEFAULT_N",
+    "bm_sqlite_synth": "ROWS",
+    "bm_tornado_http": "NCHUNKS",
+}
+
+
+# Benchmarks report their in-process timings as one JSON line per run, written
+# to the file descriptor named by this variable when it is set.
+TIMINGS_FD_ENV = "NUITKA_BENCH_TIMINGS_FD"
+TIMING_PROTOCOL_VERSION = 1
+
+# Setting this variable makes a benchmark exit early, "startup" before any of
+# its own code runs and "imports" right before the ``__main__`` block, which
+# is how start-up and import costs are probed with the very same binary.
+STARTUP_PROBE_ENV = "NUITKA_BENCH_PROBE"
+
+# Multiplies the workload size of benchmarks that have a size parameter.
+WORKLOAD_SCALE_ENV = "NUITKA_BENCH_SCALE"
+
+STARTUP_PROBE = f"""
+import os as _bench_os
+if _bench_os.environ.get("{STARTUP_PROBE_ENV}") == "startup":
+    raise SystemExit(0)
+_bench_scale = float(_bench_os.environ.get("{WORKLOAD_SCALE_ENV}", "1"))
+_bench_size = None
+def _bench_sized(size):
+    global _bench_size
+    _bench_size = max(1, round(size * _bench_scale))
+    return _bench_size
+"""
+
+TIMING_PROLOGUE = f"""
+import os as _bench_os
+if _bench_os.environ.get("{STARTUP_PROBE_ENV}") == "imports":
+    raise SystemExit(0)
+import json as _bench_json
+from time import perf_counter as _bench_clock
+_bench_samples = {{}}
+_bench_start = _bench_clock()
+"""
+
+TIMING_EPILOGUE = f"""
+_bench_total = _bench_clock() - _bench_start
+_bench_fd = _bench_os.environ.get("{TIMINGS_FD_ENV}")
+if _bench_fd:
+    _bench_report = {{
+        "version": {TIMING_PROTOCOL_VERSION},
+        "total": _bench_total,
+        "samples": _bench_samples or {{"<module>": [_bench_total]}},
+        "size": _bench_size,
+    }}
+    _bench_os.write(int(_bench_fd), (_bench_json.dumps(_bench_report) + "\\n").encode())
+"""
+
+TIMED_BLOCK = """
+_bench_t = _bench_clock()
+try:
+    pass
+finally:
+    _bench_samples.setdefault({site}, []).append(_bench_clock() - _bench_t)
+"""
+
+# Loops over anything but ``range()`` usually run a different kernel in every
+# iteration, so each iteration is reported as a site of its own.
+ITERATION_SITE = "{label!r} + ' [%d]' % _bench_iteration"
+ITERATION_COUNTER = "_bench_iteration = 0"
+ITERATION_STEP = "_bench_iteration += 1"
+
 
 class BaseReplacementVisitor(ast.NodeVisitor):
     def __init__(self):
@@ -95,9 +178,13 @@ class ReplacementVisitor(BaseReplacementVisitor):
         self.benchmark_path = benchmark_path
         self.replacements = replacements
         self.resolved_replacements = {
-            k: str((self.benchmark_path / v).resolve()) for k, v in replacements.items()
+            k: self._resolve(v) for k, v in replacements.items()
         }
 
+    def _resolve(self, value: str) -> str:
+        path = self.benchmark_path / value
+        return str(path.resolve()) if path.is_absolute() else path.as_posix()
+
     def visit_Constant(self, node):
         for replacement_type, replacement_value in self.resolved_replacements.items():
             if (
@@ -110,22 +197,197 @@ class ReplacementVisitor(BaseReplacementVisitor):
         self.generic_visit(node)
 
 
-def prepare_benchmark_file(benchmark_path: Path):
+class TimingProtocolTransformer(ast.NodeTransformer):
+    """Time the workload in the ``__main__`` block from inside the process.
+
+    Every top-level call statement and every iteration of a top-level loop
+    becomes one sample, so interpreter startup and module import are left
+    out of the numbers. Samples are kept apart per statement, since setup
+    calls and different kernels must not be averaged into one iteration.
+    Only ``range()`` loops repeat the same kernel; the iterations of any
+    other loop are kept apart per iteration index.
+    The module also gets the early exits of the startup probe, and the
+    module-level ``size_constant``, if given, is scaled by the workload
+    scale of the run.
+    """
+
+    def __init__(self, size_constant: str | None = None):
+        self.size_constant = size_constant
+
+    @staticmethod
+    def _size_operand(value: ast.expr) -> ast.expr | None:
+        """The integer literal of a size, also as the factor of a repetition."""
+        if isinstance(value, ast.Constant) and type(value.value) is int:
+            return value
+        if isinstance(value, ast.BinOp) and isinstance(value.op, ast.Mult):
+            for operand in (value.right, value.left):
+                if isinstance(operand, ast.Constant) and type(operand.value) is int:
+                    return operand
+        return None
+
+    def _scale_size(self, tree: ast.Module) -> None:
+        stmt = _size_assignment(tree, self.size_constant)
+        if stmt is None:
+            return
+        operand = self._size_operand(stmt.value)
+        if operand is None:
+            raise ValueError(f"{self.size_constant} is not an integer size")
+        sized = ast.Call(
+            func=ast.Name("_bench_sized", ast.Load()), args=[operand], keywords=[]
+        )
+        if operand is stmt.value:
+            stmt.value = sized
+        elif operand is stmt.value.right:
+            stmt.value.right = sized
+        else:
+            stmt.value.left = sized
+
+    @staticmethod
+    def _is_main_guard(node: ast.stmt) -> bool:
+        return isinstance(node, ast.If) and ast.unparse(node.test) in (
+            "__name__ == '__main__'",
+            "'__main__' == __name__",
+        )
+
+    @staticmethod
+    def _timed(body: list[ast.stmt], site: str) -> list[ast.stmt]:
+        block = ast.parse(TIMED_BLOCK.format(site=repr(site))).body
+        block[1].body = body
+        return block
+
+    @staticmethod
+    def _timed_iterations(body: list[ast.stmt], site: str) -> list[ast.stmt]:
+        site_expr = ITERATION_SITE.format(label=site)
+        block = ast.parse(TIMED_BLOCK.format(site=site_expr)).body
+        block[1].body = body
+        block[1].finalbody += ast.parse(ITERATION_STEP).body
+        return block
+
+    @staticmethod
+    def _is_range_loop(stmt: ast.For) -> bool:
+        return (
+            isinstance(stmt.iter, ast.Call)
+            and isinstance(stmt.iter.func, ast.Name)
+            and stmt.iter.func.id == "range"
+        )
+
+    @staticmethod
+    def _site(stmt: ast.stmt, sites: set[str]) -> str:
+        # The first source line names the statement in the report.
+        label = ast.unparse(stmt).splitlines()[0][:80]
+        site, count = label, 1
+        while site in sites:
+            count += 1
+            site = f"{label} #{count}"
+        sites.add(site)
+        return site
+
+    def _instrument(self, body: list[ast.stmt]) -> list[ast.stmt]:
+        instrumented = ast.parse(TIMING_PROLOGUE).body
+        sites: set[str] = set()
+        for stmt in body:
+            if isinstance(stmt, ast.For) and self._is_range_loop(stmt):
+                stmt.body = self._timed(stmt.body, self._site(stmt, sites))
+                instrumented.append(stmt)
+            elif isinstance(stmt, ast.For):
+                site = self._site(stmt, sites)
+                stmt.body = self._timed_iterations(stmt.body, site)
+                instrumented += ast.parse(ITERATION_COUNTER).body
+                instrumented.append(stmt)
+            elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+                instrumented += self._timed([stmt], self._site(stmt, sites))
+            else:
+                instrumented.append(stmt)
+        return instrumented + ast.parse(TIMING_EPILOGUE).body
+
+    @staticmethod
+    def _module_start(body: list[ast.stmt]) -> int:
+        # The docstring and ``__future__`` imports have to stay in front.
+        index = 0
+        if body and isinstance(body[0], ast.Expr) and isinstance(
+            body[0].value, ast.Constant
+        ):
+            index = 1
+        while (
+            index < len(body)
+            and isinstance(body[index], ast.ImportFrom)
+            and body[index].module == "__future__"
+        ):
+            index += 1
+        return index
+
+    def visit_Module(self, node: ast.Module) -> ast.Module:
+        for stmt in node.body:
+            if self._is_main_guard(stmt):
+                stmt.body = self._instrument(stmt.body)
+        if self.size_constant is not None:
+            self._scale_size(node)
+        start = self._module_start(node.body)
+        node.body[start:start] = ast.parse(STARTUP_PROBE).body
+        return node
+
+
+def _size_assignment(tree: ast.Module, name: str) -> ast.Assign | None:
+    """The assignment of a size, at module level or in the ``__main__`` block."""
+    bodies = [tree.body] + [
+        stmt.body
+        for stmt in tree.body
+        if TimingProtocolTransformer._is_main_guard(stmt)
+    ]
+    for body in bodies:
+        for stmt in body:
+            if (
+                isinstance(stmt, ast.Assign)
+                and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+                and stmt.targets[0].id == name
+            ):
+                return stmt
+    return None
+
+
+def workload_size(benchmark_path: Path) -> int | None:
+    """The default data size of a benchmark with a size parameter."""
+    constant = size_parameters.get(benchmark_path.name)
+    if constant is None:
+        return None
+    tree = ast.parse((benchmark_path / "run_benchmark.py").read_text())
+    stmt = _size_assignment(tree, constant)
+    if stmt is None:
+        return None
+    operand = TimingProtocolTransformer._size_operand(stmt.value)
+    return operand.value if operand is not None else None
+
+
+def scaled_size(size: int, scale: float) -> int:
+    # Must match _bench_sized in the instrumented benchmark.
+    return max(1, round(size * scale))
+
+
+def prepare_benchmark_file(
+    benchmark_path: Path, data_root: Path | None = None, instrument: bool = False
+):
     run_benchmark_path = benchmark_path / "run_benchmark.py"
     replacement = mapping.get(benchmark_path.name, None)
 
-    if replacement is None:
+    if replacement is None and not instrument:
         return
 
     with run_benchmark_path.open("r") as f:
         tree = ast.parse(f.read())
 
-    visitors: list[FileParentReplacementVisitor | ReplacementVisitor] = [
-        ReplacementVisitor(benchmark_path, replacement),
-        FileParentReplacementVisitor(),
-    ]
-    for visitor in visitors:
-        visitor.visit(tree)
+    if replacement is not None:
+        visitors: list[FileParentReplacementVisitor | ReplacementVisitor] = [
+            ReplacementVisitor(data_root or benchmark_path, replacement),
+            FileParentReplacementVisitor(),
+        ]
+        for visitor in visitors:
+            visitor.visit(tree)
+
+    if instrument:
+        tree = TimingProtocolTransformer(
+            size_parameters.get(benchmark_path.name)
+        ).visit(tree)
 
     with run_benchmark_path.open("w") as f:
         ast.fix_missing_locations(tree)
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any
+
+from rich import box
+from rich.table import Table
+
+from engine.utils import console
+
+ARTIFACT_NAMES = ("run_benchmark.bin", "run_benchmark.sh")
+
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "nuitka-performance-suite"
+)
+
+CACHE_POLICIES = ("cold", "warm", "shared")
+
+# Nuitka summarises ccache/clcache use at the end of the Scons run, e.g.
+# "Cached C files (using ccache) with result 'cache hit': 23".
+COMPILER_CACHE_RESULT = re.compile(r"with result '([^']+)': (\d+)")
+
+
+def cache_policy_options(
+    policy: str, shared_dir: Path | None = None
+) -> tuple[list[str], dict[str, str]]:
+    """Return the Nuitka flags and environment for a compile cache policy.
+
+    ``cold`` measures a from-scratch compile, ``warm`` uses Nuitka's default
+    per-user caches, and ``shared`` points every build at one cache directory.
+    """
+    if policy == "cold":
+        return ["--disable-cache=all"], {}
+    if policy == "warm":
+        return [], {}
+    if policy == "shared":
+        return [], {"NUITKA_CACHE_DIR": str(shared_dir or DEFAULT_CACHE_DIR / "nuitka")}
+    raise ValueError(f"Unknown cache policy {policy!r}")
+
+
+class CompilerCacheStats:
+    def __init__(self) -> None:
+        self.results: dict[str, int] = {}
+
+    def __call__(self, line: str) -> None:
+        match = COMPILER_CACHE_RESULT.search(line)
+        if match:
+            self.results[match.group(1)] = int(match.group(2))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": sum(n for result, n in self.results.items() if "hit" in result),
+            "misses": sum(n for result, n in self.results.items() if "miss" in result),
+            "results": dict(self.results),
+        }
+
+
+def compute_cache_key(
+    run_benchmark_path: Path,
+    requirements_path: Path,
+    nuitka_ref: str,
+    python_version: str,
+    flags: list[str],
+    staged_path: Path,
+) -> str:
+    # The binary only finds the packages of its venv at the staged path it
+    # was built in, so the path is part of the key.
+    digest = hashlib.sha256()
+    digest.update(run_benchmark_path.read_bytes())
+    digest.update(b"\0")
+    if requirements_path.exists():
+        digest.update(requirements_path.read_bytes())
+    for part in [nuitka_ref, python_version, *flags, str(staged_path)]:
+        digest.update(b"\0")
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR):
+        self.root = root / "artifacts"
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def contains(self, key: str) -> bool:
+        entry = self._entry(key)
+        return any((entry / name).exists() for name in ARTIFACT_NAMES)
+
+    def restore(self, key: str, destination: Path) -> bool:
+        if not self.contains(key):
+            return False
+        entry = self._entry(key)
+        for name in ARTIFACT_NAMES:
+            if (entry / name).exists():
+                shutil.copy2(entry / name, destination / name)
+        return True
+
+    def store(self, key: str, source: Path) -> None:
+        entry = self._entry(key)
+        # Copy into a private directory first and rename it into place, so a
+        # concurrent build of the same key never observes a partial entry.
+        staging = entry.with_name(f"{key}.{os.getpid()}.tmp")
+        staging.mkdir(parents=True, exist_ok=True)
+        for name in ARTIFACT_NAMES:
+            if (source / name).exists():
+                shutil.copy2(source / name, staging / name)
+        try:
+            staging.rename(entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def compile_time(build: dict[str, Any]) -> float | None:
+    """Time the build spent compiling, which a binary cache hit did not."""
+    if build.get("cache_hit"):
+        return build.get("cold_build_time")
+    return build.get("wall_time")
+
+
+def display_cache_stats(summaries: list[dict[str, Any]]) -> None:
+    table = Table(
+        title="[bold blue]Compile Cache[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Policy")
+    table.add_column("Binary Cache")
+    table.add_column("C Cache Hits", justify="right")
+    table.add_column("C Cache Misses", justify="right")
+    table.add_column("Build Time", justify="right")
+    table.add_column("Cold Build Time", justify="right")
+    table.add_column("Saved", justify="right")
+
+    for summary in summaries:
+        build = summary.get("build")
+        if not build or "wall_time" not in build:
+            continue
+        compiler_cache = build.get("compiler_cache") or {}
+        cold = build.get("cold_build_time")
+        saved = "-" if cold is None else f"{cold - build['wall_time']:.1f}s"
+        table.add_row(
+            summary["benchmark_name"],
+            build.get("cache_policy", "cold"),
+            "[cyan]hit[/cyan]" if build["cache_hit"] else "miss",
+            str(compiler_cache.get("hits", "-")),
+            str(compiler_cache.get("misses", "-")),
+            f"{build['wall_time']:.1f}s",
+            "-" if cold is None else f"{cold:.1f}s",
+            saved,
+        )
+
+    console.print(table)
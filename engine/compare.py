@@ -0,0 +1,216 @@
+import json
+import sqlite3
+import statistics
+from typing import Any
+
+from rich import box
+from rich.table import Table
+
+from engine.cache import compile_time
+from engine.results_store import ResultsStore
+from engine.stats import mann_whitney_p_value
+from engine.toolchain import NUITKA_REPOSITORY, resolve_git_ref
+from engine.utils import console
+
+
+def _config_key(config: str) -> str:
+    # Comparing two Nuitka commits pairs up results that differ only in the
+    # ref axis, so it is left out of the key.
+    axes = [axis for axis in config.split(",") if not axis.startswith("ref=")]
+    return ",".join(axes) or "default"
+
+
+def select_results(store: ResultsStore, selector: str) -> dict[tuple[str, str], Any]:
+    """Latest result per benchmark and config of a suite run or Nuitka ref.
+
+    A suite run keys its results by the full config, since a matrix over
+    refs holds several results per benchmark, while a ref leaves its own
+    axis out so results of different refs pair up.
+    """
+    if selector.isdigit():
+        rows = store.suite_run_results(int(selector))
+        if rows:
+            return {(row["benchmark"], row["config"]): row for row in rows}
+    rows = store.ref_results(selector)
+    if not rows:
+        resolved = resolve_git_ref(NUITKA_REPOSITORY, selector)
+        if resolved != selector:
+            rows = store.ref_results(resolved)
+    if not rows:
+        raise ValueError(f"No stored suite run or Nuitka ref matches {selector!r}")
+    return {(row["benchmark"], _config_key(row["config"])): row for row in rows}
+
+
+def _compile_time(row: sqlite3.Row) -> float | None:
+    return compile_time(json.loads(row["summary"]).get("build") or {})
+
+
+def _change(before: float | None, after: float | None) -> float | None:
+    if not before or after is None:
+        return None
+    return after / before - 1
+
+
+def _p_value(
+    store: ResultsStore, a: sqlite3.Row, b: sqlite3.Row, variant: str, column: str
+) -> float:
+    return mann_whitney_p_value(
+        store.samples(a["id"], variant, column),
+        store.samples(b["id"], variant, column),
+    )
+
+
+def compare_results(
+    store: ResultsStore,
+    baseline: str,
+    candidate: str,
+    only_tags: list[str] | None = None,
+    tags: dict[str, list[str]] | None = None,
+    alpha: float = 0.01,
+) -> dict[str, Any]:
+    """Per-benchmark changes from the baseline to the candidate results."""
+    before = select_results(store, baseline)
+    after = select_results(store, candidate)
+    if only_tags:
+        for results in (before, after):
+            for key in list(results):
+                if not set(only_tags) & set((tags or {}).get(key[0], [])):
+                    del results[key]
+    common = sorted(before.keys() & after.keys())
+
+    rows = []
+    for key in common:
+        a, b = before[key], after[key]
+        both_have_interval = all(
+            row[column] is not None
+            for row in (a, b)
+            for column in ("ratio_low", "ratio_high")
+        )
+        p_values = {
+            (variant, column): _p_value(store, a, b, variant, column)
+            for variant, column in (
+                ("nuitka", "wall_time"),
+                ("python", "wall_time"),
+                ("nuitka", "max_rss"),
+            )
+        }
+        rows.append(
+            {
+                "benchmark": key[0],
+                "config": key[1],
+                "same_host": a["host_key"] == b["host_key"],
+                "nuitka": (a["nuitka_mean"], b["nuitka_mean"]),
+                "nuitka_change": _change(a["nuitka_mean"], b["nuitka_mean"]),
+                "nuitka_significant": p_values["nuitka", "wall_time"] < alpha,
+                "python_change": _change(a["python_mean"], b["python_mean"]),
+                "python_significant": p_values["python", "wall_time"] < alpha,
+                "speedup": (a["speedup"], b["speedup"]),
+                # Disjoint confidence intervals of the two speedups.
+                "speedup_significant": both_have_interval
+                and (
+                    a["ratio_high"] < b["ratio_low"] or b["ratio_high"] < a["ratio_low"]
+                ),
+                "memory_change": _change(a["nuitka_peak_rss"], b["nuitka_peak_rss"]),
+                "memory_significant": p_values["nuitka", "max_rss"] < alpha,
+                "compile_change": _change(_compile_time(a), _compile_time(b)),
+            }
+        )
+
+    speedup_ratios = [
+        row["speedup"][1] / row["speedup"][0]
+        for row in rows
+        if row["speedup"][0] and row["speedup"][1]
+    ]
+    return {
+        "baseline": baseline,
+        "candidate": candidate,
+        "rows": rows,
+        "only_baseline": sorted(before.keys() - after.keys()),
+        "only_candidate": sorted(after.keys() - before.keys()),
+        "geometric_mean_speedup_change": (
+            statistics.geometric_mean(speedup_ratios) - 1 if speedup_ratios else None
+        ),
+    }
+
+
+def sort_comparison(comparison: dict[str, Any], order: str) -> None:
+    if order == "delta":
+        # Largest slowdown of the compiled benchmark first.
+        comparison["rows"].sort(key=lambda row: -(row["nuitka_change"] or 0.0))
+
+
+def display_comparison(comparison: dict[str, Any]) -> None:
+    if not comparison["rows"]:
+        console.print(
+            "[yellow]No benchmarks were measured in both "
+            f"{comparison['baseline']} and {comparison['candidate']}[/yellow]"
+        )
+        return
+
+    def change(value: float | None, significant: bool | None = None) -> str:
+        if value is None:
+            return "-"
+        text = f"{value:+.1%}"
+        if significant is None:
+            return text
+        if not significant:
+            return f"[dim]{text}[/dim]"
+        return f"[{'green' if value < 0 else 'red'}]{text} *[/]"
+
+    table = Table(
+        title=f"[bold blue]{comparison['baseline']} -> "
+        f"{comparison['candidate']}[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Nuitka Time", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("CPython Time", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    table.add_column("Compile Time", justify="right")
+
+    for row in comparison["rows"]:
+        label = row["benchmark"]
+        if row["config"] != "default":
+            label += f" ({row['config']})"
+        if not row["same_host"]:
+            label += " [yellow]![/yellow]"
+        before, after = row["speedup"]
+        speedup = f"{before:.3f}x -> {after:.3f}x"
+        if row["speedup_significant"]:
+            speedup = f"[{'green' if after > before else 'red'}]{speedup} *[/]"
+        table.add_row(
+            label,
+            f"{row['nuitka'][0] * 1000:.2f} -> {row['nuitka'][1] * 1000:.2f} ms",
+            change(row["nuitka_change"], row["nuitka_significant"]),
+            change(row["python_change"], row["python_significant"]),
+            speedup,
+            change(row["memory_change"], row["memory_significant"]),
+            change(row["compile_change"]),
+        )
+
+    console.print(table)
+
+    lines = ["* significant difference"]
+    if not all(row["same_host"] for row in comparison["rows"]):
+        lines.append(
+            "! measured on different hosts, so the change may come from the hardware"
+        )
+    if comparison["geometric_mean_speedup_change"] is not None:
+        lines.append(
+            "Geometric mean speedup change: "
+            f"{comparison['geometric_mean_speedup_change']:+.1%}"
+        )
+    for side in ("baseline", "candidate"):
+        missing = comparison[f"only_{side}"]
+        if missing:
+            lines.append(
+                f"Only in {comparison[side]}: "
+                + ", ".join(
+                    name if config == "default" else f"{name} ({config})"
+                    for name, config in missing
+                )
+            )
+    console.print("\n".join(lines), markup=False)
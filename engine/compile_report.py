@@ -0,0 +1,103 @@
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from rich import box
+from rich.table import Table
+
+from engine.utils import console
+
+REPORT_NAME = "compilation-report.xml"
+
+PHASES = ("optimization", "codegen", "c_compile", "link")
+
+# The compilation report only times the Python level passes per module, so
+# the phase boundaries come from the progress messages Nuitka prints. Older
+# releases announce linking as "Backend linking program", current ones as
+# "Backend C linking with N files".
+PHASE_MARKERS = [
+    (re.compile("Completed Python level compilation and optimization"), "codegen"),
+    (re.compile("Running C compilation via Scons"), "c_compile"),
+    (re.compile("Backend (C )?linking"), "link"),
+    (re.compile("Successfully created"), None),
+]
+
+
+class PhaseTimer:
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.current: str | None = "optimization"
+        self.started = perf_counter()
+
+    def _switch(self, phase: str | None) -> None:
+        now = perf_counter()
+        if self.current is not None:
+            self.phases[self.current] = (
+                self.phases.get(self.current, 0.0) + now - self.started
+            )
+        self.current = phase
+        self.started = now
+
+    def __call__(self, line: str) -> None:
+        for marker, phase in PHASE_MARKERS:
+            if marker.search(line):
+                self._switch(phase)
+                return
+
+    def finish(self) -> dict[str, float]:
+        self._switch(None)
+        return dict(self.phases)
+
+
+def parse_compilation_report(path: Path) -> dict[str, Any]:
+    root = ET.parse(path).getroot()
+    modules = root.findall("module")
+    optimization = {}
+    for element in root.iter("optimization-time"):
+        optimization.setdefault(element.get("pass"), 0.0)
+        optimization[element.get("pass")] += float(element.get("time", 0))
+
+    return {
+        "nuitka_version": root.get("nuitka_version"),
+        "completion": root.get("completion"),
+        "modules": len(modules),
+        "compiled_modules": sum(
+            1 for module in modules if "Uncompiled" not in module.get("kind", "")
+        ),
+        "optimization_passes": optimization,
+        "memory_usage": {
+            element.get("name"): int(element.get("value"))
+            for element in root.iter("memory_usage")
+        },
+    }
+
+
+def display_compile_phases(builds: list[tuple[str, dict[str, Any]]]) -> None:
+    builds = [(label, build) for label, build in builds if build.get("phases")]
+    if not builds:
+        return
+
+    table = Table(
+        title="[bold blue]Compile Time Breakdown[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Python Optimization", justify="right")
+    table.add_column("C Code Generation", justify="right")
+    table.add_column("C Compile", justify="right")
+    table.add_column("Link", justify="right")
+    table.add_column("Modules", justify="right")
+
+    for label, build in builds:
+        phases = build["phases"]
+        report = build.get("report") or {}
+        table.add_row(
+            label,
+            *(f"{phases[phase]:.1f}s" if phase in phases else "-" for phase in PHASES),
+            str(report.get("modules", "-")),
+        )
+
+    console.print(table)
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import platform
+from pathlib import Path
+from typing import Any
+
+PROC = Path("/proc")
+CPU_ROOT = Path("/sys/devices/system/cpu")
+
+GIB = 1024**3
+
+# Thresholds beyond which a measurement counts as taken on a noisy host.
+# Load is counted on top of the one process being measured.
+MAX_EXTRA_LOAD_PER_CPU = 0.5
+MAX_STEAL = 0.01
+MIN_AVAILABLE_MEMORY = GIB
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def available_memory() -> int | None:
+    try:
+        with open(PROC / "meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def governors(cpus: list[int] | None = None) -> list[str]:
+    paths = (
+        [CPU_ROOT / f"cpu{cpu}" for cpu in cpus]
+        if cpus
+        else sorted(CPU_ROOT.glob("cpu[0-9]*"))
+    )
+    found = {_read(path / "cpufreq" / "scaling_governor") for path in paths}
+    return sorted(governor for governor in found if governor)
+
+
+def turbo_enabled() -> bool | None:
+    no_turbo = _read(CPU_ROOT / "intel_pstate" / "no_turbo")
+    if no_turbo is not None:
+        return no_turbo == "0"
+    boost = _read(CPU_ROOT / "cpufreq" / "boost")
+    if boost is not None:
+        return boost == "1"
+    return None
+
+
+def aslr_level() -> int | None:
+    level = _read(PROC / "sys" / "kernel" / "randomize_va_space")
+    return int(level) if level is not None else None
+
+
+def load_average() -> float | None:
+    loadavg = _read(PROC / "loadavg")
+    return float(loadavg.split()[0]) if loadavg else None
+
+
+def cpu_ticks() -> tuple[int, int] | None:
+    """Total and stolen jiffies of all CPUs since boot."""
+    stat = _read(PROC / "stat")
+    if stat is None:
+        return None
+    fields = [int(value) for value in stat.splitlines()[0].split()[1:]]
+    # user nice system idle iowait irq softirq steal guest guest_nice, where
+    # the guest times are already included in user and nice.
+    return sum(fields[:8]), fields[7] if len(fields) > 7 else 0
+
+
+def cpu_model() -> str | None:
+    cpuinfo = _read(PROC / "cpuinfo")
+    for line in (cpuinfo or "").splitlines():
+        if line.startswith("model name"):
+            return line.partition(":")[2].strip()
+    return None
+
+
+def host_identity(cpus: list[int] | None = None) -> dict[str, Any]:
+    """What makes results from this host comparable with each other."""
+    return {
+        "hostname": platform.node(),
+        "kernel": platform.release(),
+        "machine": platform.machine(),
+        "cpu_model": cpu_model(),
+        "cpus": available_cpus(),
+        "governors": governors(cpus),
+        "turbo": turbo_enabled(),
+        "aslr": aslr_level(),
+    }
+
+
+def host_key(identity: dict[str, Any]) -> str:
+    encoded = json.dumps(identity, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class HostMonitor:
+    """Snapshot the host state before and during a measurement.
+
+    The static settings come from the first snapshot. Load and available
+    memory keep their worst value, and steal time is taken over the whole
+    window between the first and the last snapshot.
+    """
+
+    def __init__(self, cpus: list[int] | None = None):
+        self.cpus = cpus
+        self.snapshots: list[dict[str, Any]] = []
+        self._ticks: list[tuple[int, int]] = []
+
+    def sample(self) -> None:
+        self.snapshots.append(
+            {
+                "governors": governors(self.cpus),
+                "turbo": turbo_enabled(),
+                "aslr": aslr_level(),
+                "load": load_average(),
+                "available_memory": available_memory(),
+            }
+        )
+        ticks = cpu_ticks()
+        if ticks is not None:
+            self._ticks.append(ticks)
+
+    def fingerprint(self) -> dict[str, Any]:
+        first = self.snapshots[0]
+        loads = [s["load"] for s in self.snapshots if s["load"] is not None]
+        memory = [
+            s["available_memory"]
+            for s in self.snapshots
+            if s["available_memory"] is not None
+        ]
+        steal = None
+        if len(self._ticks) > 1:
+            total = self._ticks[-1][0] - self._ticks[0][0]
+            steal = (self._ticks[-1][1] - self._ticks[0][1]) / total if total else 0.0
+        return {
+            "governors": first["governors"],
+            "governor_changed": any(
+                s["governors"] != first["governors"] for s in self.snapshots
+            ),
+            "turbo": first["turbo"],
+            "aslr": first["aslr"],
+            "cpus": available_cpus(),
+            "max_load": max(loads) if loads else None,
+            "min_available_memory": min(memory) if memory else None,
+            "steal": steal,
+        }
+
+
+def quality_issues(fingerprint: dict[str, Any]) -> dict[str, list[str]]:
+    """Split what is wrong with the host into settings and actual noise.
+
+    Settings like the governor make results less comparable between hosts,
+    while noise means this particular measurement was disturbed.
+    """
+    settings = []
+    if fingerprint["governors"] and fingerprint["governors"] != ["performance"]:
+        settings.append(f"governor {'/'.join(fingerprint['governors'])}")
+    if fingerprint["turbo"]:
+        settings.append("turbo boost on")
+    if fingerprint["aslr"]:
+        settings.append("ASLR on")
+
+    noise = []
+    if fingerprint["governor_changed"]:
+        noise.append("governor changed during measurement")
+    load = fingerprint["max_load"]
+    if load is not None and load - 1 > fingerprint["cpus"] * MAX_EXTRA_LOAD_PER_CPU:
+        noise.append(f"load average {load:.2f}")
+    if fingerprint["steal"] is not None and fingerprint["steal"] > MAX_STEAL:
+        noise.append(f"{fingerprint['steal']:.1%} steal time")
+    memory = fingerprint["min_available_memory"]
+    if memory is not None and memory < MIN_AVAILABLE_MEMORY:
+        noise.append(f"only {memory / GIB:.1f} GiB memory available")
+    return {"settings": settings, "noise": noise}
@@ -0,0 +1,88 @@
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+from engine.benchmark_prepare import (
+    TIMING_PROTOCOL_VERSION,
+    mapping,
+    size_parameters,
+)
+from engine.staging import STAGING_IGNORE_PATTERNS
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _ignored(name: str) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in STAGING_IGNORE_PATTERNS)
+
+
+def default_python() -> str:
+    # Benchmark venvs are created by a bare ``uv venv``, so whatever uv
+    # discovers here is the interpreter they will use.
+    result = subprocess.run(["uv", "python", "find"], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to find the default Python: {result.stderr}")
+    return result.stdout.strip()
+
+
+def fingerprint_benchmark(benchmark_path: Path, toolchain: list[str]) -> str:
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(benchmark_path):
+        dirs[:] = sorted(d for d in dirs if not _ignored(d))
+        for name in sorted(files):
+            if _ignored(name):
+                continue
+            path = Path(root) / name
+            digest.update(path.relative_to(benchmark_path).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    digest.update(repr(mapping.get(benchmark_path.name)).encode())
+    digest.update(repr(size_parameters.get(benchmark_path.name)).encode())
+    digest.update(f"timing-protocol-{TIMING_PROTOCOL_VERSION}".encode())
+    for part in toolchain:
+        digest.update(b"\0")
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            self.entries = json.loads(path.read_text())["benchmarks"]
+
+    @staticmethod
+    def key(benchmark_name: str, config_name: str) -> str:
+        return f"{benchmark_name}::{config_name}"
+
+    def unchanged(self, key: str, fingerprint: str) -> dict[str, Any] | None:
+        entry = self.entries.get(key)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry["summary"]
+
+    def cold_build_time(self, key: str) -> float | None:
+        return self.entries.get(key, {}).get("cold_build_time")
+
+    def update(self, key: str, fingerprint: str, summary: dict[str, Any]) -> None:
+        entry = {"fingerprint": fingerprint, "summary": summary}
+        build = summary.get("build", {})
+        # Keep the last from-scratch build time as the reference that warm
+        # and cached builds are compared against.
+        if build.get("cache_policy") == "cold" and not build.get("cache_hit"):
+            entry["cold_build_time"] = build.get("wall_time")
+        elif self.cold_build_time(key) is not None:
+            entry["cold_build_time"] = self.cold_build_time(key)
+        self.entries[key] = entry
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"benchmarks": self.entries}, indent=2) + "\n")
+        tmp.replace(self.path)
@@ -0,0 +1,126 @@
+import itertools
+from dataclasses import dataclass, fields
+from typing import Any
+
+from rich import box
+from rich.table import Table
+
+from engine.cache import compile_time
+from engine.toolchain import NUITKA_REF
+from engine.utils import console
+
+BASE_FLAGS = [
+    "--remove-output",
+    "--assume-yes-for-downloads",
+]
+
+AXIS_FLAGS = {
+    "lto": {"yes": ["--lto=yes"], "no": ["--lto=no"], "auto": ["--lto=auto"]},
+    "compiler": {"clang": ["--clang"], "gcc": []},
+    "pgo": {"on": ["--pgo-python"], "off": []},
+}
+
+
+@dataclass(frozen=True)
+class BuildConfig:
+    lto: str = "yes"
+    compiler: str = "clang"
+    pgo: str = "on"
+    # Thin vs. full LTO is decided by the Nuitka branch, so it is an axis of
+    # refs rather than of flags.
+    ref: str = NUITKA_REF
+
+    @property
+    def name(self) -> str:
+        default = BuildConfig()
+        changed = [
+            f"{field.name}={getattr(self, field.name)}"
+            for field in fields(self)
+            if getattr(self, field.name) != getattr(default, field.name)
+        ]
+        return ",".join(changed) or "default"
+
+    @property
+    def flags(self) -> list[str]:
+        flags = []
+        for axis, values in AXIS_FLAGS.items():
+            flags += values[getattr(self, axis)]
+        return flags + BASE_FLAGS
+
+
+def parse_axis(spec: str) -> tuple[str, list[str]]:
+    axis, _, values = spec.partition("=")
+    axes = [field.name for field in fields(BuildConfig)]
+    if axis not in axes or not values:
+        raise ValueError(f"Expected AXIS=V1,V2 with AXIS one of {', '.join(axes)}")
+    values = values.split(",")
+    if axis in AXIS_FLAGS:
+        unknown = [value for value in values if value not in AXIS_FLAGS[axis]]
+        if unknown:
+            raise ValueError(
+                f"Unknown {axis} value(s) {', '.join(unknown)}, "
+                f"expected {', '.join(AXIS_FLAGS[axis])}"
+            )
+    return axis, values
+
+
+def expand_matrix(axes: list[tuple[str, list[str]]] | None) -> list[BuildConfig]:
+    if not axes:
+        return [BuildConfig()]
+    names = [axis for axis, _ in axes]
+    return [
+        BuildConfig(**dict(zip(names, combination)))
+        for combination in itertools.product(*(values for _, values in axes))
+    ]
+
+
+def display_matrix(summaries: list[dict[str, Any]]) -> None:
+    table = Table(
+        title="[bold blue]Build Configuration Matrix[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Config", style="cyan")
+    table.add_column("Nuitka Mean", style="yellow", justify="right")
+    table.add_column("vs. First Config", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Compile Time", justify="right")
+    table.add_column("Binary Size", justify="right")
+
+    def format_compile_time(build: dict[str, Any]) -> str:
+        seconds = compile_time(build)
+        if not build.get("cache_hit"):
+            return f"{seconds:.1f}s"
+        # The binary came from the cache, so show the last from-scratch build.
+        if seconds is None:
+            return "[dim]cached[/dim]"
+        return f"{seconds:.1f}s [dim](cached)[/dim]"
+
+    baselines: dict[str, float] = {}
+    for summary in summaries:
+        name = summary["benchmark_name"]
+        if "error" in summary:
+            table.add_row(
+                name, summary["config"], "[bold red]FAILED[/bold red]", "", "", "", ""
+            )
+            continue
+
+        mean = summary["nuitka"]["mean"]
+        baseline = baselines.setdefault(name, mean)
+        relative = mean / baseline if baseline > 0 else float("inf")
+        relative_style = "[bold green]" if relative <= 1 else "[bold red]"
+        speedup = summary["comparison"]["speedup_ratio"]
+        speedup_style = "[bold green]" if speedup > 1 else "[bold red]"
+        build = summary["build"]
+        table.add_row(
+            name,
+            summary["config"],
+            f"{mean * 1000:.2f} ms",
+            f"{relative_style}{relative:.3f}x[/]",
+            f"{speedup_style}{speedup:.2f}x[/]",
+            format_compile_time(build),
+            f"{build['binary_size'] / 1024**2:.1f} MiB",
+        )
+
+    console.print(table)
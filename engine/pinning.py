@@ -0,0 +1,117 @@
+import os
+import shutil
+from pathlib import Path
+
+ISOLATED_CPUS = Path("/sys/devices/system/cpu/isolated")
+CPU_ROOT = Path("/sys/devices/system/cpu")
+NODE_ROOT = Path("/sys/devices/system/node")
+
+
+def parse_cpu_list(spec: str) -> list[int]:
+    """Parse the kernel's cpu list format, e.g. ``2-3,6``."""
+    cpus = []
+    for part in spec.strip().split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus += range(int(start), int(end or start) + 1)
+    return cpus
+
+
+def format_cpu_list(cpus: list[int]) -> str:
+    return ",".join(str(cpu) for cpu in cpus)
+
+
+def isolated_cpus() -> list[int]:
+    try:
+        return parse_cpu_list(ISOLATED_CPUS.read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def available_cpu_list() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def numa_nodes() -> dict[int, list[int]]:
+    nodes = {}
+    for path in sorted(NODE_ROOT.glob("node[0-9]*")):
+        try:
+            nodes[int(path.name[4:])] = parse_cpu_list((path / "cpulist").read_text())
+        except (OSError, ValueError):
+            continue
+    return nodes
+
+
+def physical_cores(cpus: list[int]) -> list[list[int]]:
+    """Group the CPUs into physical cores, keeping SMT siblings together."""
+    cores = {}
+    for cpu in cpus:
+        try:
+            siblings = parse_cpu_list(
+                (
+                    CPU_ROOT / f"cpu{cpu}" / "topology" / "thread_siblings_list"
+                ).read_text()
+            )
+        except (OSError, ValueError):
+            siblings = [cpu]
+        cores.setdefault(min(siblings), []).append(cpu)
+    return list(cores.values())
+
+
+def partition_cpus(cpus: list[int], slots: int) -> list[list[int]]:
+    """Split the CPUs into at most ``slots`` disjoint sets of whole cores.
+
+    Cores are ordered by NUMA node before being cut into equal contiguous
+    chunks, so when the slots divide the nodes evenly every set stays on a
+    single node.
+    """
+    node_of = {
+        cpu: node for node, node_cpus in numa_nodes().items() for cpu in node_cpus
+    }
+    cores = sorted(
+        physical_cores(cpus), key=lambda core: (node_of.get(core[0], 0), core[0])
+    )
+    slots = max(1, min(slots, len(cores)))
+    size = len(cores) // slots
+    return [
+        [cpu for core in cores[index * size : (index + 1) * size] for cpu in core]
+        for index in range(slots)
+    ]
+
+
+def reserve_housekeeping(cpus: list[int]) -> tuple[list[int], list[int]]:
+    """Split the CPUs into housekeeping CPUs and the ones left to measure on.
+
+    Housekeeping is whatever the suite does between measurements, like
+    analysing results and writing them out. It runs on the available CPUs
+    outside ``cpus`` if there are any, else on the first physical core of
+    ``cpus``, which is then no longer measured on.
+    """
+    others = [cpu for cpu in available_cpu_list() if cpu not in cpus]
+    if others:
+        return others, cpus
+    cores = sorted(physical_cores(cpus))
+    if len(cores) < 2:
+        return [], cpus
+    return cores[0], [cpu for core in cores[1:] for cpu in core]
+
+
+def measurement_cpus(requested: str | None = None) -> list[int] | None:
+    """CPUs to pin measurements to: the requested set, else the isolated ones."""
+    if requested:
+        return parse_cpu_list(requested)
+    cpus = isolated_cpus()
+    if hasattr(os, "sched_getaffinity"):
+        cpus = [cpu for cpu in cpus if cpu in os.sched_getaffinity(0)]
+    return cpus or None
+
+
+def pin_command(command: list[str], cpus: list[int] | None) -> list[str]:
+    if not cpus:
+        return command
+    if shutil.which("taskset") is None:
+        raise RuntimeError("Pinning measurements to CPUs requires taskset")
+    return ["taskset", "--cpu-list", format_cpu_list(cpus), *command]
@@ -0,0 +1,172 @@
+import math
+import random
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Any, Sequence
+
+from rich import box
+from rich.table import Table
+
+from engine.matrix import BuildConfig
+from engine.results_store import ResultsStore
+from engine.utils import console
+
+PERMUTATIONS = 999
+MIN_SEGMENT = 2
+
+# Series where a higher value is worse: a slowdown raises the Nuitka mean but
+# lowers the speedup over CPython.
+SERIES = {
+    "nuitka_mean": True,
+    "speedup": False,
+}
+
+
+@dataclass
+class ChangePoint:
+    index: int
+    before: float
+    after: float
+    p_value: float
+
+    @property
+    def change(self) -> float:
+        return self.after / self.before - 1 if self.before else math.inf
+
+
+def _best_split(values: Sequence[float]) -> tuple[int, float]:
+    """The split with the largest scaled shift in mean, CUSUM style."""
+    n = len(values)
+    total = sum(values)
+    prefix = 0.0
+    best_index, best_score = 0, 0.0
+    for k in range(1, n):
+        prefix += values[k - 1]
+        if k < MIN_SEGMENT or n - k < MIN_SEGMENT:
+            continue
+        shift = (total - prefix) / (n - k) - prefix / k
+        score = abs(shift) * math.sqrt(k * (n - k) / n)
+        if score > best_score:
+            best_index, best_score = k, score
+    return best_index, best_score
+
+
+def _split_p_value(values: Sequence[float], score: float, rng: random.Random) -> float:
+    # Under the null hypothesis of no change any order of the runs is as
+    # likely as the observed one, which makes the scan over all splits an
+    # honest test without assuming a distribution.
+    shuffled = list(values)
+    exceeding = 0
+    for _ in range(PERMUTATIONS):
+        rng.shuffle(shuffled)
+        if _best_split(shuffled)[1] >= score:
+            exceeding += 1
+    return (exceeding + 1) / (PERMUTATIONS + 1)
+
+
+def change_points(
+    values: Sequence[float], alpha: float = 0.01, offset: int = 0
+) -> list[ChangePoint]:
+    """Find shifts in the mean by binary segmentation with permutation tests."""
+    if len(values) < 2 * MIN_SEGMENT:
+        return []
+    index, score = _best_split(values)
+    if index == 0:
+        return []
+    p_value = _split_p_value(values, score, random.Random(len(values)))
+    if p_value > alpha:
+        return []
+
+    before, after = values[:index], values[index:]
+    return [
+        *change_points(before, alpha, offset),
+        ChangePoint(
+            offset + index,
+            sum(before) / len(before),
+            sum(after) / len(after),
+            p_value,
+        ),
+        *change_points(after, alpha, offset + index),
+    ]
+
+
+def find_regressions(
+    store: ResultsStore,
+    benchmarks: list[str] | None = None,
+    alpha: float = 0.01,
+    min_effect: float = 0.02,
+) -> list[dict[str, Any]]:
+    """First significant slowdown in each benchmark's history on each host."""
+    regressions = []
+    rows = store.history(benchmarks)
+    for (benchmark, config, host_key), group in groupby(
+        rows, key=lambda row: (row["benchmark"], row["config"], row["host_key"])
+    ):
+        history = list(group)
+        for series, higher_is_worse in SERIES.items():
+            values = [row[series] for row in history]
+            for point in change_points(values, alpha):
+                worse = point.change > 0 if higher_is_worse else point.change < 0
+                if worse and abs(point.change) >= min_effect:
+                    run = history[point.index]
+                    regressions.append(
+                        {
+                            "benchmark": benchmark,
+                            "config": config,
+                            "host_key": host_key,
+                            "series": series,
+                            "runs": len(history),
+                            "recorded_at": run["recorded_at"],
+                            "nuitka_ref": run["nuitka_ref"],
+                            "python_version": run["python_version"],
+                            "previous_ref": history[point.index - 1]["nuitka_ref"],
+                            "before": point.before,
+                            "after": point.after,
+                            "change": point.change,
+                            "p_value": point.p_value,
+                        }
+                    )
+                    break
+    return regressions
+
+
+def display_regressions(regressions: list[dict[str, Any]]) -> None:
+    if not regressions:
+        console.print("[green]No significant slowdowns in the recorded history[/green]")
+        return
+
+    table = Table(
+        title="[bold blue]Performance Regressions[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Metric")
+    table.add_column("First Slow Run")
+    table.add_column("Nuitka Commit")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Change", justify="right", style="bold red")
+    table.add_column("p", justify="right")
+
+    def format_value(series: str, value: float) -> str:
+        if series == "speedup":
+            return f"{value:.3f}x"
+        return f"{value * 1000:.2f} ms"
+
+    for regression in regressions:
+        label = regression["benchmark"]
+        if regression["config"] != BuildConfig().name:
+            label += f" ({regression['config']})"
+        table.add_row(
+            label,
+            regression["series"],
+            regression["recorded_at"],
+            f"{regression['previous_ref'][:10]} -> {regression['nuitka_ref'][:10]}",
+            format_value(regression["series"], regression["before"]),
+            format_value(regression["series"], regression["after"]),
+            f"{regression['change']:+.1%}",
+            f"{regression['p_value']:.3f}",
+        )
+
+    console.print(table)
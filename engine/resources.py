@@ -0,0 +1,257 @@
+import os
+import statistics
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+PROC = Path("/proc")
+
+# ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+try:
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+    CLOCK_TICKS = 100
+
+
+@dataclass
+class ResourceUsage:
+    wall_time: float
+    user_time: float
+    system_time: float
+    max_rss: int
+    minor_faults: int
+    major_faults: int
+    voluntary_switches: int
+    involuntary_switches: int
+
+    @classmethod
+    def from_rusage(cls, rusage: Any, wall_time: float) -> "ResourceUsage":
+        return cls(
+            wall_time=wall_time,
+            user_time=rusage.ru_utime,
+            system_time=rusage.ru_stime,
+            max_rss=rusage.ru_maxrss * RSS_UNIT,
+            minor_faults=rusage.ru_minflt,
+            major_faults=rusage.ru_majflt,
+            voluntary_switches=rusage.ru_nvcsw,
+            involuntary_switches=rusage.ru_nivcsw,
+        )
+
+    @property
+    def cpu_time(self) -> float:
+        return self.user_time + self.system_time
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SchedStats:
+    """Scheduler view of an exited, not yet reaped process.
+
+    ``on_cpu_time`` and ``run_delay`` come from ``schedstat`` and only cover
+    the main thread, since the other threads are gone once the process has
+    exited. The CPU times from ``stat`` cover all threads, split into the
+    process itself and the children it waited for; the rusage CPU time is
+    their sum.
+    """
+
+    on_cpu_time: float
+    run_delay: float
+    timeslices: int
+    process_cpu_time: float
+    children_cpu_time: float
+
+    @classmethod
+    def read(cls, pid: int) -> "SchedStats | None":
+        try:
+            schedstat = (PROC / str(pid) / "schedstat").read_text().split()
+            stat = (PROC / str(pid) / "stat").read_text()
+        except OSError:
+            return None
+        fields = stat[stat.rindex(")") + 2 :].split()
+        return cls(
+            on_cpu_time=int(schedstat[0]) / 1e9,
+            run_delay=int(schedstat[1]) / 1e9,
+            timeslices=int(schedstat[2]),
+            process_cpu_time=(int(fields[11]) + int(fields[12])) / CLOCK_TICKS,
+            children_cpu_time=(int(fields[13]) + int(fields[14])) / CLOCK_TICKS,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def summarize_cpu(
+    usages: list[dict[str, Any]], scheds: list[dict[str, Any] | None]
+) -> dict[str, Any] | None:
+    """Mean CPU time per run, split by where it went, and CPU efficiency.
+
+    Efficiency is CPU time over wall time: above 1 the run kept several
+    cores busy, well below 1 it spent its time waiting.
+    """
+    if not usages:
+        return None
+    wall_time = statistics.fmean(usage["wall_time"] for usage in usages)
+    cpu_time = statistics.fmean(
+        usage["user_time"] + usage["system_time"] for usage in usages
+    )
+    summary: dict[str, Any] = {
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "efficiency": cpu_time / wall_time if wall_time > 0 else 0.0,
+    }
+    scheds = [sched for sched in scheds if sched is not None]
+    if scheds:
+        for field in (
+            "on_cpu_time",
+            "run_delay",
+            "process_cpu_time",
+            "children_cpu_time",
+        ):
+            summary[field] = statistics.fmean(sched[field] for sched in scheds)
+    return summary
+
+
+def format_bytes(size: float) -> str:
+    return f"{size / 1024**2:.0f} MiB"
+
+
+def summarize_footprint(usages: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Peak and mean RSS plus mean fault and context switch counts per run."""
+    if not usages:
+        return None
+    summary: dict[str, Any] = {
+        "runs": len(usages),
+        "peak_rss": max(usage["max_rss"] for usage in usages),
+        "mean_rss": statistics.fmean(usage["max_rss"] for usage in usages),
+    }
+    for field in (
+        "minor_faults",
+        "major_faults",
+        "voluntary_switches",
+        "involuntary_switches",
+    ):
+        summary[field] = statistics.fmean(usage[field] for usage in usages)
+    return summary
+
+
+def _read_stat(pid: int) -> tuple[str, int, float, int] | None:
+    try:
+        stat = (PROC / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses, so split around
+    # the last closing one.
+    comm = stat[stat.index("(") + 1 : stat.rindex(")")]
+    fields = stat[stat.rindex(")") + 2 :].split()
+    ppid = int(fields[1])
+    cpu_time = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    rss = int(fields[21]) * PAGE_SIZE
+    return comm, ppid, cpu_time, rss
+
+
+def _scan_proc() -> dict[int, tuple[str, int, float, int]]:
+    stats = {}
+    for entry in PROC.iterdir():
+        if entry.name.isdigit():
+            stat = _read_stat(int(entry.name))
+            if stat is not None:
+                stats[int(entry.name)] = stat
+    return stats
+
+
+class _ProcScanner:
+    """One thread scanning ``/proc`` for every active process tree sampler.
+
+    Concurrent builds each have a sampler, and a full scan per sampler would
+    multiply the ``/proc`` reads and the GIL contention with the slot count.
+    """
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self._samplers: set["ProcessTreeSampler"] = set()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def register(self, sampler: "ProcessTreeSampler") -> None:
+        with self._condition:
+            self._samplers.add(sampler)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, sampler: "ProcessTreeSampler") -> None:
+        # Samples are recorded under the same lock, so none arrives later.
+        with self._condition:
+            self._samplers.discard(sampler)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._samplers:
+                    self._condition.wait()
+            time.sleep(self.interval)
+            stats = _scan_proc()
+            with self._condition:
+                for sampler in self._samplers:
+                    sampler._record(stats)
+
+
+class ProcessTreeSampler:
+    """Periodically walk a process tree and record peak RSS and CPU per tool.
+
+    ``wait4`` only reports the tree as a whole, which cannot tell a clang or
+    linker blowing up apart from Nuitka itself. Processes shorter than the
+    sampling interval may be missed, so the numbers are lower bounds. All
+    samplers share the scans of one background thread.
+    """
+
+    _scanner = _ProcScanner()
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._seen: dict[int, tuple[str, float, int]] = {}
+
+    @staticmethod
+    def available() -> bool:
+        return PROC.is_dir()
+
+    def __enter__(self) -> "ProcessTreeSampler":
+        self._scanner.register(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        self._scanner.unregister(self)
+
+    def _record(self, stats: dict[int, tuple[str, int, float, int]]) -> None:
+        tree = {self.pid}
+        changed = True
+        while changed:
+            children = {pid for pid, stat in stats.items() if stat[1] in tree}
+            changed = not children <= tree
+            tree |= children
+
+        for pid in tree & stats.keys():
+            comm, _, cpu_time, rss = stats[pid]
+            _, seen_cpu, seen_rss = self._seen.get(pid, (comm, 0.0, 0))
+            self._seen[pid] = (comm, max(cpu_time, seen_cpu), max(rss, seen_rss))
+
+    def by_tool(self) -> dict[str, dict[str, float]]:
+        tools: dict[str, dict[str, float]] = {}
+        for comm, cpu_time, rss in self._seen.values():
+            tool = tools.setdefault(
+                comm, {"processes": 0, "cpu_time": 0.0, "peak_rss": 0}
+            )
+            tool["processes"] += 1
+            tool["cpu_time"] += cpu_time
+            tool["peak_rss"] = max(tool["peak_rss"], rss)
+        return tools
@@ -0,0 +1,218 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+RESULTS_DB_NAME = "results.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suite_runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    host_key TEXT NOT NULL,
+    host TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    suite_run_id INTEGER NOT NULL REFERENCES suite_runs(id) ON DELETE CASCADE,
+    recorded_at TEXT NOT NULL,
+    benchmark TEXT NOT NULL,
+    config TEXT NOT NULL,
+    nuitka_ref TEXT NOT NULL,
+    python_version TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    host_key TEXT NOT NULL,
+    runs INTEGER,
+    python_mean REAL,
+    nuitka_mean REAL,
+    speedup REAL,
+    ratio_low REAL,
+    ratio_high REAL,
+    python_peak_rss INTEGER,
+    nuitka_peak_rss INTEGER,
+    summary TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS results_history
+    ON results (benchmark, config, recorded_at);
+CREATE INDEX IF NOT EXISTS results_key
+    ON results (benchmark, nuitka_ref, python_version, flags, host_key);
+CREATE INDEX IF NOT EXISTS results_suite_run ON results (suite_run_id);
+
+CREATE TABLE IF NOT EXISTS samples (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    variant TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    wall_time REAL NOT NULL,
+    user_time REAL,
+    system_time REAL,
+    max_rss INTEGER,
+    minor_faults INTEGER,
+    major_faults INTEGER,
+    voluntary_switches INTEGER,
+    involuntary_switches INTEGER,
+    on_cpu_time REAL,
+    run_delay REAL,
+    children_cpu_time REAL,
+    PRIMARY KEY (result_id, variant, seq)
+) WITHOUT ROWID;
+"""
+
+RUSAGE_COLUMNS = (
+    "user_time",
+    "system_time",
+    "max_rss",
+    "minor_faults",
+    "major_faults",
+    "voluntary_switches",
+    "involuntary_switches",
+)
+SCHED_COLUMNS = ("on_cpu_time", "run_delay", "children_cpu_time")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class ResultsStore:
+    """SQLite history of every summary and raw sample the suite produced."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{path} was written by a newer version of the suite "
+                f"(schema {version}, supported {SCHEMA_VERSION})"
+            )
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def begin_suite_run(self, host_key: str, host: dict[str, Any]) -> int:
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO suite_runs (started_at, host_key, host) VALUES (?, ?, ?)",
+                (_now(), host_key, json.dumps(host)),
+            )
+        return cursor.lastrowid
+
+    def record(
+        self,
+        suite_run_id: int,
+        summary: dict[str, Any],
+        raw: dict[str, Any],
+        nuitka_ref: str,
+        python_version: str,
+        flags: list[str],
+        host_key: str,
+    ) -> int:
+        sampling = summary.get("sampling") or {}
+        memory = {
+            variant: summary[variant].get("memory") or {}
+            for variant in ("python", "nuitka")
+        }
+        with self.connection:
+            cursor = self.connection.execute(
+                """
+                INSERT INTO results (
+                    suite_run_id, recorded_at, benchmark, config, nuitka_ref,
+                    python_version, flags, host_key, runs, python_mean,
+                    nuitka_mean, speedup, ratio_low, ratio_high,
+                    python_peak_rss, nuitka_peak_rss, summary
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    suite_run_id,
+                    _now(),
+                    summary["benchmark_name"],
+                    summary["config"],
+                    nuitka_ref,
+                    python_version,
+                    " ".join(flags),
+                    host_key,
+                    sampling.get("runs"),
+                    summary["python"]["mean"],
+                    summary["nuitka"]["mean"],
+                    summary["comparison"]["speedup_ratio"],
+                    sampling.get("ratio_low"),
+                    sampling.get("ratio_high"),
+                    memory["python"].get("peak_rss"),
+                    memory["nuitka"].get("peak_rss"),
+                    json.dumps(summary),
+                ),
+            )
+            result_id = cursor.lastrowid
+            self.connection.executemany(
+                f"""
+                INSERT INTO samples (
+                    result_id, variant, seq, wall_time,
+                    {", ".join(RUSAGE_COLUMNS + SCHED_COLUMNS)}
+                ) VALUES ({", ".join("?" * (4 + len(RUSAGE_COLUMNS + SCHED_COLUMNS)))})
+                """,
+                self._sample_rows(result_id, raw),
+            )
+        return result_id
+
+    def history(self, benchmarks: list[str] | None = None) -> list[sqlite3.Row]:
+        """All results in recording order, grouped by benchmark, config and host."""
+        query = "SELECT * FROM results"
+        params: list[str] = []
+        if benchmarks:
+            query += " WHERE " + " OR ".join(["benchmark LIKE ?"] * len(benchmarks))
+            params = [f"%{benchmark}%" for benchmark in benchmarks]
+        query += " ORDER BY benchmark, config, host_key, recorded_at, id"
+        return self.connection.execute(query, params).fetchall()
+
+    def suite_run_results(self, suite_run_id: int) -> list[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT * FROM results WHERE suite_run_id = ? ORDER BY recorded_at, id",
+            (suite_run_id,),
+        ).fetchall()
+
+    def ref_results(self, nuitka_ref: str) -> list[sqlite3.Row]:
+        """Results of a Nuitka commit, which may be given abbreviated."""
+        return self.connection.execute(
+            "SELECT * FROM results WHERE nuitka_ref = ? OR nuitka_ref LIKE ? "
+            "ORDER BY recorded_at, id",
+            (nuitka_ref, f"{nuitka_ref}%"),
+        ).fetchall()
+
+    def samples(self, result_id: int, variant: str, column: str) -> list[float]:
+        if column not in ("wall_time",) + RUSAGE_COLUMNS + SCHED_COLUMNS:
+            raise ValueError(f"Unknown sample column {column}")
+        rows = self.connection.execute(
+            f"SELECT {column} FROM samples WHERE result_id = ? AND variant = ? "
+            "ORDER BY seq",
+            (result_id, variant),
+        )
+        return [value for (value,) in rows if value is not None]
+
+    @staticmethod
+    def _sample_rows(result_id: int, raw: dict[str, Any]):
+        for variant, result in zip(("python", "nuitka"), raw["results"]):
+            usages = result.get("rusage") or [{}] * len(result["times"])
+            scheds = result.get("sched") or [None] * len(result["times"])
+            for seq, (wall_time, usage, sched) in enumerate(
+                zip(result["times"], usages, scheds)
+            ):
+                yield (
+                    result_id,
+                    variant,
+                    seq,
+                    wall_time,
+                    *(usage.get(column) for column in RUSAGE_COLUMNS),
+                    *((sched or {}).get(column) for column in SCHED_COLUMNS),
+                )
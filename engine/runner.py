@@ -0,0 +1,131 @@
+import os
+import shlex
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Iterator
+
+from engine.resources import ResourceUsage, SchedStats
+from engine.utils import _get_envvars
+
+# posix_spawn has no way to set the working directory of the child, so the
+# parent changes into it around the spawn. The lock keeps concurrent
+# measurements from spawning into each other's directories. The change is
+# visible to every thread of the process, so while benchmarks are measured
+# all file access must use absolute paths: the command line options are
+# resolved when parsed, the defaults are absolute already, and builds are
+# staged below them.
+_SPAWN_LOCK = threading.Lock()
+
+STDERR_LOG = "benchmark_stderr.log"
+
+
+@dataclass
+class RunSample:
+    usage: ResourceUsage
+    sched: SchedStats | None = None
+
+    @property
+    def wall_time(self) -> float:
+        return self.usage.wall_time
+
+
+@contextmanager
+def pinned(cpus: list[int] | None) -> Iterator[None]:
+    """Pin the calling thread, and so every child it spawns, to the CPUs."""
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+class ProcessRunner:
+    """Run a benchmark command repeatedly with as little overhead as possible.
+
+    Every run is started with ``os.posix_spawn`` directly, without a shell,
+    and reaped with ``wait4``, so each sample carries the wall time and the
+    rusage of exactly that run, plus the scheduler statistics of the exited
+    process read from ``/proc`` just before reaping it. Output goes to
+    ``/dev/null``, except stderr of the last run, which is kept for error
+    messages.
+    """
+
+    def __init__(self, cwd: Path, env: dict[str, str] | None = None):
+        self.cwd = cwd
+        self.env = {**_get_envvars(), **(env or {})}
+
+    def _file_actions(self, fds: dict[int, Path]) -> list[tuple]:
+        actions = [
+            (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+            (
+                os.POSIX_SPAWN_OPEN,
+                2,
+                str(self.cwd / STDERR_LOG),
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                0o644,
+            ),
+        ]
+        for fd, path in fds.items():
+            actions.append(
+                (
+                    os.POSIX_SPAWN_OPEN,
+                    fd,
+                    str(path),
+                    os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                    0o644,
+                )
+            )
+        return actions
+
+    def run_once(
+        self,
+        command: str,
+        env: dict[str, str] | None = None,
+        fds: dict[int, Path] | None = None,
+    ) -> RunSample:
+        argv = shlex.split(command)
+        path = str(self.cwd / argv[0])
+        file_actions = self._file_actions(fds or {})
+        child_env = {**self.env, **(env or {})}
+
+        with _SPAWN_LOCK:
+            previous = os.getcwd()
+            os.chdir(self.cwd)
+            try:
+                start = perf_counter()
+                pid = os.posix_spawn(path, argv, child_env, file_actions=file_actions)
+            finally:
+                os.chdir(previous)
+        # Wait without reaping, so /proc still has the exited process.
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        wall_time = perf_counter() - start
+        sched = SchedStats.read(pid)
+        _, status, rusage = os.wait4(pid, 0)
+
+        returncode = os.waitstatus_to_exitcode(status)
+        if returncode != 0:
+            stderr = (self.cwd / STDERR_LOG).read_text(errors="replace")
+            raise RuntimeError(
+                f"{command} exited with {returncode}: {stderr.strip()[-2000:]}"
+            )
+        return RunSample(ResourceUsage.from_rusage(rusage, wall_time), sched)
+
+    def run(
+        self,
+        command: str,
+        runs: int,
+        warmup: int = 0,
+        env: dict[str, str] | None = None,
+        fds: dict[int, Path] | None = None,
+    ) -> list[RunSample]:
+        for _ in range(warmup):
+            self.run_once(command, env, fds)
+        return [self.run_once(command, env, fds) for _ in range(runs)]
@@ -0,0 +1,116 @@
+import math
+import statistics
+from typing import Any
+
+from rich import box
+from rich.table import Table
+
+from engine.utils import console
+
+DEFAULT_SCALES = (0.25, 0.5, 1.0, 2.0, 4.0)
+
+# Change of the speedup per doubling of the workload size below which the
+# advantage counts as holding steady.
+TREND_TOLERANCE = 0.02
+
+
+def parse_scales(spec: str) -> list[float]:
+    scales = sorted({float(value) for value in spec.split(",") if value})
+    if not scales or scales[0] <= 0:
+        raise ValueError(f"Workload scales must be positive: {spec}")
+    return scales
+
+
+def _power_fit(sizes: list[float], times: list[float]) -> dict[str, float]:
+    """Fit time = coefficient * size ** exponent in log-log space.
+
+    Workloads are rarely linear in their size, e.g. spectral_norm is
+    quadratic, so the exponent is fitted instead of assumed.
+    """
+    if len(set(sizes)) < 2:
+        return {"exponent": math.nan, "coefficient": math.nan}
+    fit = statistics.linear_regression(
+        [math.log(size) for size in sizes], [math.log(time) for time in times]
+    )
+    return {"exponent": fit.slope, "coefficient": math.exp(fit.intercept)}
+
+
+def fit_scaling(points: list[dict[str, Any]]) -> dict[str, Any]:
+    """Fit a power law per variant and the trend of the speedup.
+
+    The trend is the slope of the log speedup over log2 of the size, i.e. the
+    relative change of the speedup whenever the workload doubles.
+    """
+    sizes = [point["size"] for point in points]
+    fits = {
+        variant: _power_fit(sizes, [point[variant] for point in points])
+        for variant in ("python", "nuitka")
+    }
+
+    trend = 0.0
+    if len(set(sizes)) > 1:
+        trend = math.expm1(
+            statistics.linear_regression(
+                [math.log2(size) for size in sizes],
+                [math.log(point["speedup"]) for point in points],
+            ).slope
+        )
+    if trend > TREND_TOLERANCE:
+        verdict = "grows"
+    elif trend < -TREND_TOLERANCE:
+        verdict = "shrinks"
+    else:
+        verdict = "holds"
+
+    return {
+        "python": fits["python"],
+        "nuitka": fits["nuitka"],
+        "speedup_per_doubling": trend,
+        "verdict": verdict,
+    }
+
+
+def _exponent(fit: dict[str, float]) -> str:
+    return "-" if math.isnan(fit["exponent"]) else f"{fit['exponent']:.2f}"
+
+
+def display_scaling(sweeps: list[dict[str, Any]]) -> None:
+    if not sweeps:
+        return
+
+    table = Table(
+        title="[bold blue]Workload Scaling[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Sizes", justify="right")
+    table.add_column("Speedup by Size")
+    table.add_column("Size Exponent (CPython/Nuitka)", justify="right")
+    table.add_column("Per Doubling", justify="right")
+    table.add_column("Advantage")
+
+    styles = {"grows": "bold green", "holds": "yellow", "shrinks": "bold red"}
+    for sweep in sweeps:
+        points = sweep["points"]
+        fit = sweep["fit"]
+        if sweep.get("error") and len(points) < 2:
+            table.add_row(
+                sweep["label"],
+                f"{points[0]['size']:g}" if points else "-",
+                " -> ".join(f"{point['speedup']:.2f}x" for point in points),
+                "",
+                "",
+                "[bold red]FAILED[/bold red]",
+            )
+            continue
+        table.add_row(
+            sweep["label"],
+            f"{points[0]['size']:g} - {points[-1]['size']:g}",
+            " -> ".join(f"{point['speedup']:.2f}x" for point in points),
+            f"{_exponent(fit['python'])} / {_exponent(fit['nuitka'])}",
+            f"{fit['speedup_per_doubling']:+.1%}",
+            f"[{styles[fit['verdict']]}]{fit['verdict']}[/]",
+        )
+
+    console.print(table)
@@ -0,0 +1,342 @@
+import os
+import signal
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from rich import box
+from rich.markup import escape
+from rich.table import Table
+
+from engine.tvenv import Benchmark
+from engine.utils import Timer, console
+from engine.pinning import (
+    available_cpu_list,
+    format_cpu_list,
+    partition_cpus,
+    pin_command,
+    reserve_housekeeping,
+)
+from engine.host import GIB, available_cpus, available_memory
+from engine.resources import format_bytes
+from engine.runner import pinned
+from engine.stats import SamplingPolicy
+
+COMPILER_TOOLS = ("clang", "gcc", "cc1", "ld", "lld", "collect2")
+
+# Concurrent measurement is only kept if running next to the other slots
+# slows the calibration benchmark down by less than this fraction, and does
+# not grow its coefficient of variation by more than the factor below.
+MAX_INTERFERENCE_SLOWDOWN = 0.03
+MAX_INTERFERENCE_NOISE = 1.5
+CALIBRATION_RUNS = 6
+
+
+@dataclass
+class BuildResult:
+    benchmark: Benchmark
+    duration: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class MeasurementResult:
+    benchmark: Benchmark
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def compute_job_slots(compile_jobs: int, memory_per_build: int) -> int:
+    # Every build runs its own clang with ``compile_jobs`` parallel jobs, so the
+    # slot count is the number of such builds that fit into the CPUs and RAM.
+    slots = max(1, available_cpus() // max(1, compile_jobs))
+    memory = available_memory()
+    if memory is not None and memory_per_build > 0:
+        slots = min(slots, max(1, memory // memory_per_build))
+    return slots
+
+
+class BuildScheduler:
+    def __init__(
+        self,
+        jobs: int | None = None,
+        compile_jobs: int = 4,
+        memory_per_build: int = 4 * GIB,
+    ):
+        self.compile_jobs = compile_jobs
+        self.jobs = jobs or compute_job_slots(compile_jobs, memory_per_build)
+
+    def _build(self, benchmark: Benchmark) -> BuildResult:
+        timer = Timer()
+        try:
+            with timer:
+                benchmark.compile(jobs=self.compile_jobs)
+        except Exception as e:
+            benchmark.build_info["wall_time"] = timer.time_taken
+            return BuildResult(benchmark, timer.time_taken, str(e))
+        benchmark.build_info["wall_time"] = timer.time_taken
+        return BuildResult(benchmark, timer.time_taken)
+
+    def build(self, benchmarks: list[Benchmark]) -> list[BuildResult]:
+        console.rule(
+            f"Compiling {len(benchmarks)} benchmarks with {self.jobs} build slots "
+            f"x {self.compile_jobs} compiler jobs"
+        )
+        results: list[BuildResult | None] = [None] * len(benchmarks)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(self._build, b): index
+                for index, b in enumerate(benchmarks)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                name = escape(result.benchmark.label)
+                if result.ok:
+                    console.print(
+                        f"[green]Built[/green] {name} in {result.duration:.1f}s"
+                    )
+                else:
+                    console.print(
+                        f"[bold red]Failed[/bold red] {name}: {escape(result.error)}"
+                    )
+                results[futures[future]] = result
+
+        return results
+
+
+@dataclass
+class Calibration:
+    solo: dict[str, dict[str, float]]
+    loaded: dict[str, dict[str, float]]
+
+    @property
+    def slowdown(self) -> float:
+        return max(
+            self.loaded[variant]["mean"] / self.solo[variant]["mean"] - 1
+            for variant in self.solo
+        )
+
+    @property
+    def noise(self) -> float:
+        def variation(stats: dict[str, float]) -> float:
+            return stats["stddev"] / stats["mean"] if stats["mean"] > 0 else 0.0
+
+        # A floor keeps near-silent solo runs from flagging harmless jitter.
+        return max(
+            variation(self.loaded[variant])
+            / max(variation(self.solo[variant]), 0.005)
+            for variant in self.solo
+        )
+
+    @property
+    def interference(self) -> bool:
+        return (
+            self.slowdown > MAX_INTERFERENCE_SLOWDOWN
+            or self.noise > MAX_INTERFERENCE_NOISE
+        )
+
+
+class MeasurementScheduler:
+    """Measure several benchmarks at once, each on its own set of cores.
+
+    The calling thread analyses and stores each result while the other
+    slots are still measuring, so it is kept on housekeeping cores of its
+    own instead of competing with the slots.
+    """
+
+    def __init__(self, slots: int = 1, cpus: list[int] | None = None):
+        self.cpus = cpus
+        self.cpu_sets: list[list[int] | None] = [cpus]
+        self.housekeeping: list[int] = []
+        self.calibration: Calibration | None = None
+        if slots > 1:
+            self.housekeeping, measured = reserve_housekeeping(
+                cpus or available_cpu_list()
+            )
+            cpu_sets = partition_cpus(measured, slots)
+            if len(cpu_sets) > 1:
+                self.cpu_sets = cpu_sets
+            else:
+                console.print(
+                    "[yellow]Not enough cores for concurrent measurement, "
+                    "measuring serially[/yellow]"
+                )
+
+    @property
+    def slots(self) -> int:
+        return len(self.cpu_sets)
+
+    @contextmanager
+    def _background_load(self, benchmark: Benchmark) -> Iterator[None]:
+        # Keep every other slot busy with the benchmark binary itself, which
+        # is the kind of load concurrent measurements put on each other.
+        loop = f"while :; do {benchmark.executable} >/dev/null 2>&1; done"
+        processes = [
+            subprocess.Popen(
+                pin_command(["sh", "-c", loop], cpus),
+                cwd=benchmark.build_path,
+                start_new_session=True,
+            )
+            for cpus in self.cpu_sets[1:]
+        ]
+        try:
+            yield
+        finally:
+            for process in processes:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+
+    def calibrate(self, benchmark: Benchmark) -> Calibration:
+        policy = SamplingPolicy(
+            min_runs=CALIBRATION_RUNS,
+            max_runs=CALIBRATION_RUNS,
+            ci_target=0.0,
+            warmup=1,
+            interleave="off",
+        )
+
+        def measure() -> dict[str, dict[str, float]]:
+            results = benchmark.run(policy, self.cpu_sets[0])["results"]
+            return {
+                variant: {"mean": result["mean"], "stddev": result["stddev"]}
+                for variant, result in zip(("python", "nuitka"), results)
+            }
+
+        console.rule(f"Calibrating concurrent measurement on {benchmark.label}")
+        solo = measure()
+        with self._background_load(benchmark):
+            loaded = measure()
+        return Calibration(solo, loaded)
+
+    def _measure(
+        self, benchmark: Benchmark, sampling: SamplingPolicy, slot: int
+    ) -> MeasurementResult:
+        cpus = self.cpu_sets[slot]
+        where = f" on CPUs {format_cpu_list(cpus)}" if cpus else ""
+        benchmark_path = benchmark.benchmark_path
+        console.rule(
+            f"Running {benchmark.label} @ "
+            f"{benchmark_path.parent.name}/{benchmark_path.name}{where}"
+        )
+        try:
+            benchmark.run(sampling, cpus)
+        except Exception as e:
+            benchmark.cleanup()
+            console.print(
+                f"[bold red]Failed[/bold red] {benchmark.label}: {escape(str(e))}"
+            )
+            return MeasurementResult(benchmark, str(e))
+        except BaseException:
+            benchmark.cleanup()
+            raise
+        return MeasurementResult(benchmark)
+
+    def measure(
+        self, benchmarks: list[Benchmark], sampling: SamplingPolicy
+    ) -> Iterator[MeasurementResult]:
+        """Run the benchmarks, yielding each result as its measurement completes.
+
+        A benchmark that fails to run is yielded with its error, like a
+        failed build, so the rest of the suite still gets measured.
+        """
+        if self.slots > 1 and len(benchmarks) > 1:
+            try:
+                self.calibration = self.calibrate(benchmarks[0])
+            except Exception as e:
+                console.print(
+                    f"[yellow]Calibration failed, measuring serially: "
+                    f"{escape(str(e))}[/yellow]"
+                )
+                self.cpu_sets = [self.cpus]
+        if self.calibration is not None:
+            console.print(
+                f"Concurrent measurement slows {benchmarks[0].label} down by "
+                f"{self.calibration.slowdown:+.1%} with "
+                f"{self.calibration.noise:.2f}x the solo run-to-run variation",
+                markup=False,
+            )
+            if self.calibration.interference:
+                console.print(
+                    "[yellow]Interference between measurement slots detected, "
+                    "measuring serially[/yellow]"
+                )
+                self.cpu_sets = [self.cpus]
+
+        if self.slots == 1 or len(benchmarks) == 1:
+            for benchmark in benchmarks:
+                yield self._measure(benchmark, sampling, 0)
+            return
+
+        console.rule(
+            f"Measuring {len(benchmarks)} benchmarks in {self.slots} slots: "
+            + " | ".join(format_cpu_list(cpus) for cpus in self.cpu_sets)
+            + f", housekeeping on {format_cpu_list(self.housekeeping) or 'any CPU'}"
+        )
+        free = list(range(self.slots))
+        pending = iter(benchmarks)
+        # The worker threads inherit the housekeeping CPUs and pin themselves
+        # to their slot for each run.
+        with pinned(self.housekeeping), ThreadPoolExecutor(
+            max_workers=self.slots
+        ) as executor:
+            running = {}
+            while True:
+                while free and (benchmark := next(pending, None)) is not None:
+                    slot = free.pop()
+                    future = executor.submit(self._measure, benchmark, sampling, slot)
+                    running[future] = slot
+                if not running:
+                    break
+                future = next(as_completed(running))
+                free.append(running.pop(future))
+                yield future.result()
+
+
+def display_build_times(results: list[BuildResult]) -> None:
+    table = Table(
+        title="[bold blue]Build Times[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Build Time", style="yellow", justify="right")
+    table.add_column("CPU Time", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    table.add_column("Peak Compiler RSS", justify="right")
+    table.add_column("Status")
+
+    for result in sorted(results, key=lambda r: r.duration, reverse=True):
+        if not result.ok:
+            status = "[bold red]FAILED[/bold red]"
+        elif result.benchmark.cache_hit:
+            status = "[cyan]CACHED[/cyan]"
+        else:
+            status = "[green]OK[/green]"
+        resources = result.benchmark.build_info["resources"].values()
+        tools = result.benchmark.build_info.get("tools") or {}
+        compiler_rss = [
+            tool["peak_rss"]
+            for name, tool in tools.items()
+            if name.startswith(COMPILER_TOOLS)
+        ]
+        table.add_row(
+            result.benchmark.label,
+            f"{result.duration:.1f}s",
+            f"{sum(r['user_time'] + r['system_time'] for r in resources):.1f}s",
+            format_bytes(max((r["max_rss"] for r in resources), default=0)),
+            format_bytes(max(compiler_rss)) if compiler_rss else "-",
+            status,
+        )
+
+    total = sum(r.duration for r in results)
+    table.add_row("[bold]Total (sequential)[/bold]", f"{total:.1f}s", "", "", "", "")
+    console.print(table)
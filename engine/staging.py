@@ -0,0 +1,56 @@
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from engine.benchmark_prepare import prepare_benchmark_file
+
+DEFAULT_BUILD_ROOT = Path(tempfile.gettempdir()) / "nuitka-performance-suite"
+
+STAGING_IGNORE_PATTERNS = (
+    ".venv",
+    "__pycache__",
+    "*.bin",
+    "*.build",
+    "*.dist",
+    "*.onefile-build",
+    "run_benchmark.sh",
+    "benchmark_results.json",
+    "benchmark_stderr.log",
+    "nuitka-crash-report.xml",
+    "compilation-report.xml",
+    "timings_*.jsonl",
+)
+
+STAGING_IGNORE = shutil.ignore_patterns(*STAGING_IGNORE_PATTERNS)
+
+
+def stage_benchmark(
+    benchmark_path: Path,
+    build_root: Path = DEFAULT_BUILD_ROOT,
+    config_name: str = "default",
+) -> Path:
+    """Copy a benchmark into its scratch directory and transform it there.
+
+    The staged directory keeps the benchmark's name, since the source
+    transformations are looked up by it, and the source tree is never written.
+    The scratch directory is the same in every run of a benchmark and build
+    config: a compiled binary keeps the ``sys.prefix`` of the venv it was
+    built against, so a cached binary only finds its packages when it is
+    restored into a stage at the same path, with the venv created again.
+    Concurrent suite runs therefore need build roots of their own.
+    """
+    slug = re.sub(r"[^\w.,=-]", "_", config_name)
+    scratch = build_root / f"{benchmark_path.name}-{slug}"
+    shutil.rmtree(scratch, ignore_errors=True)
+    scratch.mkdir(parents=True)
+    staged = scratch / benchmark_path.name
+    shutil.copytree(benchmark_path, staged, ignore=STAGING_IGNORE)
+    # Data paths stay relative, since the benchmark always runs from its
+    # staged directory.
+    prepare_benchmark_file(staged, data_root=Path("."), instrument=True)
+    return staged
+
+
+def remove_stage(staged: Path) -> None:
+    shutil.rmtree(staged.parent, ignore_errors=True)
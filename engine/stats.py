@@ -0,0 +1,175 @@
+import math
+import random
+import statistics
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+VARIANTS = ("python", "nuitka")
+
+
+@dataclass
+class SamplingPolicy:
+    min_runs: int = 10
+    max_runs: int = 100
+    # Stop once the confidence interval of the CPython/Nuitka ratio is
+    # narrower than this fraction of the ratio itself.
+    ci_target: float = 0.02
+    confidence: float = 0.95
+    warmup: int = 5
+    # How CPython and Nuitka runs are ordered within a batch: "off" runs all
+    # of one before the other, "alternate" and "random" switch every block.
+    interleave: str = "random"
+    block_size: int = 2
+
+    def blocks(self, runs: int, rng: random.Random) -> list[tuple[int, list[str]]]:
+        if self.interleave == "off":
+            return [(runs, list(VARIANTS))]
+
+        size = max(2, self.block_size)
+        sizes = [size] * max(1, runs // size)
+        sizes[-1] += runs - sum(sizes)
+        blocks = []
+        for index, block_runs in enumerate(sizes):
+            order = list(VARIANTS)
+            if self.interleave == "random":
+                rng.shuffle(order)
+            elif index % 2:
+                order.reverse()
+            blocks.append((block_runs, order))
+        return blocks
+
+    def next_batch(self, runs: int) -> int:
+        if runs >= self.max_runs:
+            return 0
+        if runs < self.min_runs:
+            return max(2, self.min_runs - runs)
+        return max(2, min(self.max_runs - runs, runs // 2))
+
+
+@dataclass
+class RatioInterval:
+    ratio: float
+    low: float
+    high: float
+
+    @property
+    def relative_width(self) -> float:
+        if self.ratio == 0 or math.isinf(self.ratio):
+            return float("inf")
+        return (self.high - self.low) / self.ratio
+
+
+def ratio_confidence_interval(
+    numerator: Sequence[float], denominator: Sequence[float], confidence: float = 0.95
+) -> RatioInterval:
+    """Confidence interval of mean(numerator) / mean(denominator).
+
+    Uses the delta method, which is cheap enough to evaluate after every
+    batch of runs.
+    """
+    mean_n = statistics.fmean(numerator)
+    mean_d = statistics.fmean(denominator)
+    if mean_d <= 0:
+        return RatioInterval(float("inf"), float("-inf"), float("inf"))
+    ratio = mean_n / mean_d
+    if len(numerator) < 2 or len(denominator) < 2 or mean_n <= 0:
+        return RatioInterval(ratio, float("-inf"), float("inf"))
+
+    relative_variance = statistics.variance(numerator) / (
+        len(numerator) * mean_n**2
+    ) + statistics.variance(denominator) / (len(denominator) * mean_d**2)
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * ratio * math.sqrt(relative_variance)
+    return RatioInterval(ratio, ratio - half_width, ratio + half_width)
+
+
+def bootstrap_ratio_interval(
+    numerator: Sequence[float],
+    denominator: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    rng: random.Random | None = None,
+) -> RatioInterval:
+    """Percentile bootstrap interval of mean(numerator) / mean(denominator).
+
+    Both samples are resampled independently, so unlike the delta method
+    this makes no assumption about the shape of the timing distributions.
+    """
+    rng = rng or random.Random(0)
+    ratio = statistics.fmean(numerator) / statistics.fmean(denominator)
+    ratios = sorted(
+        statistics.fmean(rng.choices(numerator, k=len(numerator)))
+        / statistics.fmean(rng.choices(denominator, k=len(denominator)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (resamples - 1))]
+    high = ratios[math.ceil((1 - tail) * (resamples - 1))]
+    return RatioInterval(ratio, low, high)
+
+
+def mann_whitney_p_value(a: Sequence[float], b: Sequence[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test, normal approximation."""
+    n_a, n_b = len(a), len(b)
+    if not n_a or not n_b:
+        return 1.0
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        tie_term += (end - start + 1) ** 3 - (end - start + 1)
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n_a * (n_a + 1) / 2
+    n = n_a + n_b
+    variance = n_a * n_b / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the mean of U.
+    z = (abs(u - n_a * n_b / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, 2 * (1 - statistics.NormalDist().cdf(max(z, 0.0))))
+
+
+def describe_samples(samples: Sequence[float]) -> dict[str, float]:
+    return {
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def relative_trend(samples: Sequence[float]) -> float:
+    """Least-squares slope of the samples over run order, relative to their mean."""
+    if len(samples) < 3:
+        return 0.0
+    slope = statistics.linear_regression(range(len(samples)), samples).slope
+    return slope / statistics.fmean(samples)
+
+
+def detect_drift(python: Sequence[float], nuitka: Sequence[float]) -> dict[str, Any]:
+    half = min(len(python), len(nuitka)) // 2
+    first = (
+        statistics.fmean(python[:half]) / statistics.fmean(nuitka[:half])
+        if half
+        else 0.0
+    )
+    second = (
+        statistics.fmean(python[half:]) / statistics.fmean(nuitka[half:])
+        if half
+        else 0.0
+    )
+    return {
+        "python_trend": relative_trend(python),
+        "nuitka_trend": relative_trend(nuitka),
+        "ratio_first_half": first,
+        "ratio_second_half": second,
+    }
@@ -0,0 +1,155 @@
+import re
+import statistics
+from pathlib import Path
+from typing import Any
+
+from rich import box
+from rich.table import Table
+
+from engine.utils import console
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+EXTREMES = 5
+
+
+def benchmark_tags(benchmark_path: Path) -> list[str]:
+    """The ``[tool.pyperformance] tags`` of a benchmark, if it has any."""
+    pyproject = benchmark_path / "pyproject.toml"
+    if not pyproject.exists():
+        return []
+    with pyproject.open("rb") as f:
+        tags = tomllib.load(f).get("tool", {}).get("pyperformance", {}).get("tags")
+    if isinstance(tags, str):
+        tags = re.split(r"[\s,]+", tags)
+    return sorted(tag for tag in tags or [] if tag)
+
+
+def _geometric_mean(values: list[float]) -> float | None:
+    values = [value for value in values if value > 0 and value != float("inf")]
+    return statistics.geometric_mean(values) if values else None
+
+
+def suite_summary(
+    summaries: list[dict[str, Any]], tags: dict[str, list[str]]
+) -> dict[str, Any]:
+    """Geometric mean speedup overall and per tag, extremes and memory delta."""
+    results = [s for s in summaries if "error" not in s and "comparison" in s]
+    ranked = sorted(results, key=lambda s: s["comparison"]["speedup_ratio"])
+
+    by_tag: dict[str, list[float]] = {}
+    for summary in results:
+        for tag in tags.get(summary["benchmark_name"], []):
+            by_tag.setdefault(tag, []).append(summary["comparison"]["speedup_ratio"])
+
+    significance = {"faster": 0, "slower": 0, "insignificant": 0}
+    for summary in results:
+        comparison = summary["comparison"]
+        if not comparison.get("significant", True):
+            significance["insignificant"] += 1
+        elif comparison["is_nuitka_faster"]:
+            significance["faster"] += 1
+        else:
+            significance["slower"] += 1
+
+    memory = [
+        (s["python"]["memory"]["peak_rss"], s["nuitka"]["memory"]["peak_rss"])
+        for s in results
+        if s["python"].get("memory") and s["nuitka"].get("memory")
+    ]
+    memory_ratio = _geometric_mean([nuitka / python for python, nuitka in memory])
+
+    return {
+        "benchmarks": len(results),
+        "failed": len(summaries) - len(results),
+        "geometric_mean": _geometric_mean(
+            [s["comparison"]["speedup_ratio"] for s in results]
+        ),
+        "tags": {
+            tag: {
+                "benchmarks": len(speedups),
+                "geometric_mean": _geometric_mean(speedups),
+            }
+            for tag, speedups in sorted(by_tag.items())
+        },
+        "significance": significance,
+        "best": [
+            (s["benchmark_name"], s["comparison"]["speedup_ratio"])
+            for s in reversed(ranked[-EXTREMES:])
+        ],
+        "worst": [
+            (s["benchmark_name"], s["comparison"]["speedup_ratio"])
+            for s in ranked[:EXTREMES]
+        ],
+        "memory": {
+            "benchmarks": len(memory),
+            "geometric_mean_ratio": memory_ratio,
+            "mean_delta": (
+                statistics.fmean(nuitka - python for python, nuitka in memory)
+                if memory
+                else None
+            ),
+        },
+    }
+
+
+def display_suite_summary(config: str, suite: dict[str, Any]) -> None:
+    if not suite["benchmarks"]:
+        return
+
+    def speedup(value: float | None) -> str:
+        if value is None:
+            return "-"
+        style = "bold green" if value > 1 else "bold red"
+        return f"[{style}]{value:.3f}x[/]"
+
+    table = Table(
+        title=f"[bold blue]Suite Summary ({config})[/bold blue]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+    )
+    table.add_column("Group", style="cyan")
+    table.add_column("Benchmarks", justify="right")
+    table.add_column("Geometric Mean Speedup", justify="right")
+
+    table.add_row(
+        "[bold]All[/bold]", str(suite["benchmarks"]), speedup(suite["geometric_mean"])
+    )
+    for tag, group in suite["tags"].items():
+        table.add_row(tag, str(group["benchmarks"]), speedup(group["geometric_mean"]))
+    console.print(table)
+
+    extremes = Table(box=box.ROUNDED, header_style="bold magenta")
+    extremes.add_column(f"Best {EXTREMES}", style="green")
+    extremes.add_column("Speedup", justify="right")
+    extremes.add_column(f"Worst {EXTREMES}", style="red")
+    extremes.add_column("Speedup", justify="right")
+    for index in range(max(len(suite["best"]), len(suite["worst"]))):
+        row = []
+        for ranked in (suite["best"], suite["worst"]):
+            if index < len(ranked):
+                row += [ranked[index][0], f"{ranked[index][1]:.3f}x"]
+            else:
+                row += ["", ""]
+        extremes.add_row(*row)
+    console.print(extremes)
+
+    significance = suite["significance"]
+    lines = [
+        f"Geometric mean speedup: {speedup(suite['geometric_mean'])} over "
+        f"{suite['benchmarks']} benchmarks"
+        + (f", {suite['failed']} failed" if suite["failed"] else ""),
+        f"Significantly faster: {significance['faster']}, slower: "
+        f"{significance['slower']}, no significant difference: "
+        f"{significance['insignificant']}",
+    ]
+    memory = suite["memory"]
+    if memory["geometric_mean_ratio"] is not None:
+        lines.append(
+            f"Peak RSS: {memory['geometric_mean_ratio'] - 1:+.1%} geometric mean, "
+            f"{memory['mean_delta'] / 1024**2:+.1f} MiB per benchmark on average"
+        )
+    console.print("\n".join(lines))
@@ -0,0 +1,109 @@
+import json
+import statistics
+from pathlib import Path
+from typing import Any
+
+from engine.benchmark_prepare import (
+    STARTUP_PROBE_ENV,
+    TIMING_PROTOCOL_VERSION,
+    TIMINGS_FD_ENV,
+)
+
+# The file descriptor benchmarks write their timing reports to. The runner
+# opens it on a per-variant file for every measured run.
+TIMINGS_FD = 3
+
+TIMINGS_FILES = {
+    "python": "timings_python.jsonl",
+    "nuitka": "timings_nuitka.jsonl",
+}
+
+
+STARTUP_PROBES = ("startup", "imports")
+
+
+def timings_env() -> dict[str, str]:
+    return {TIMINGS_FD_ENV: str(TIMINGS_FD)}
+
+
+def probe_env(probe: str) -> dict[str, str]:
+    return {STARTUP_PROBE_ENV: probe}
+
+
+def split_startup(total: float, probes: dict[str, float]) -> dict[str, float]:
+    """Split the mean wall time of a run using the mean probe times.
+
+    Interpreter teardown is paid by the probes as well and so ends up in
+    the startup part.
+    """
+    startup = probes["startup"]
+    imports = max(0.0, probes["imports"] - startup)
+    return {
+        "startup": startup,
+        "imports": imports,
+        "compute": max(0.0, total - startup - imports),
+    }
+
+
+def load_timing_reports(path: Path, skip: int = 0) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    reports = [json.loads(line) for line in path.read_text().splitlines() if line]
+    for report in reports:
+        if report.get("version") != TIMING_PROTOCOL_VERSION:
+            raise ValueError(
+                f"{path} holds timing protocol {report.get('version')}, "
+                f"expected {TIMING_PROTOCOL_VERSION}"
+            )
+    return reports[skip:]
+
+
+def _describe_site(samples: list[float]) -> dict[str, Any]:
+    return {
+        "iterations": len(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "total": sum(samples),
+    }
+
+
+def summarize_in_process(
+    reports: list[dict[str, Any]], workload: str | None = None
+) -> dict[str, Any] | None:
+    """Summarize the in-process samples of every timed statement.
+
+    The steady-state iteration is the ``workload`` statement, by default
+    the one the runs spent the most time in, so setup and teardown calls
+    around it do not dilute the number.
+    """
+    if not reports:
+        return None
+
+    # The first iteration of a run still pays for cold caches and lazy
+    # imports, so it only counts when it is the only one. Only ``range()``
+    # loops give a site several samples per run; every other loop reports
+    # each iteration as a site of its own, so no kernel is dropped here.
+    by_site: dict[str, list[float]] = {}
+    for report in reports:
+        for site, run_samples in report["samples"].items():
+            by_site.setdefault(site, []).extend(
+                run_samples[1:] if len(run_samples) > 1 else run_samples
+            )
+
+    sites = {site: _describe_site(samples) for site, samples in by_site.items()}
+    if workload not in sites:
+        workload = max(sites, key=lambda site: sites[site]["total"])
+    main = sites[workload]
+    totals = [report["total"] for report in reports]
+    return {
+        "runs": len(reports),
+        "workload": workload,
+        "iterations": main["iterations"],
+        "compute_mean": statistics.fmean(totals),
+        "iteration_mean": main["mean"],
+        "iteration_median": main["median"],
+        "iteration_stddev": main["stddev"],
+        "throughput": 1 / main["mean"] if main["mean"] > 0 else float("inf"),
+        "sites": sites,
+    }
@@ -0,0 +1,152 @@
+import functools
+import hashlib
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from engine.cache import DEFAULT_CACHE_DIR
+from engine.utils import run_command_in_subprocess
+
+if TYPE_CHECKING:
+    from engine.wheelhouse import Wheelhouse
+
+NUITKA_REPOSITORY = "https://github.com/KRRT7/Nuitka"
+NUITKA_REF = "thin-flto"
+
+TOOLCHAIN_PACKAGES = ["wheel", "setuptools"]
+
+
+@functools.cache
+def resolve_git_ref(repository: str, ref: str) -> str:
+    # Branch names move, so key on the commit they point at when we can see it.
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", repository, ref],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ref
+    if result.returncode != 0 or not result.stdout.strip():
+        return ref
+    return result.stdout.split()[0]
+
+
+def _query_interpreter(python: Path, code: str) -> str:
+    result = subprocess.run([str(python), "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to query {python}: {result.stderr}")
+    return result.stdout.strip()
+
+
+def interpreter_version(python: Path) -> str:
+    return _query_interpreter(
+        python, "import sys, platform; print(sys.version, platform.machine())"
+    )
+
+
+class Toolchain:
+    def __init__(self, path: Path, nuitka_ref: str, python_version: str):
+        self.path = path
+        self.nuitka_ref = nuitka_ref
+        self.python_version = python_version
+
+    @property
+    def python(self) -> Path:
+        return self.path / "bin" / "python"
+
+    @functools.cached_property
+    def site_packages(self) -> str:
+        return _query_interpreter(
+            self.python, "import sysconfig; print(sysconfig.get_path('purelib'))"
+        )
+
+    def env(self) -> dict[str, str]:
+        # Nuitka and its build helpers are importable from the toolchain, while
+        # the benchmark's own dependencies keep coming from its venv.
+        return {"PYTHONPATH": self.site_packages}
+
+
+class Toolchains:
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        repository: str = NUITKA_REPOSITORY,
+        ref: str = NUITKA_REF,
+        wheelhouse: "Wheelhouse | None" = None,
+    ):
+        self.root = root / "toolchains"
+        self.repository = repository
+        self.ref = ref
+        self.wheelhouse = wheelhouse
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._toolchains: dict[tuple[str, str], Toolchain] = {}
+
+    def resolve(self, ref: str | None = None) -> str:
+        ref = ref or self.ref
+        if self.wheelhouse is not None:
+            if ref != self.wheelhouse.lock["nuitka"]["ref"]:
+                raise RuntimeError(
+                    f"Nuitka {ref} was not prefetched into the wheelhouse"
+                )
+            return self.wheelhouse.nuitka_commit
+        return resolve_git_ref(self.repository, ref)
+
+    def get(self, python: Path, ref: str | None = None) -> Toolchain:
+        """Return the toolchain for ``python``, installing it on first use."""
+        python_version = interpreter_version(python)
+        key = (self.resolve(ref), python_version)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._toolchains:
+                self._toolchains[key] = self._create(python, *key)
+            return self._toolchains[key]
+
+    def _create(self, python: Path, nuitka_ref: str, python_version: str) -> Toolchain:
+        digest = hashlib.sha256(f"{nuitka_ref}\0{python_version}".encode())
+        path = self.root / digest.hexdigest()[:16]
+        toolchain = Toolchain(path, nuitka_ref, python_version)
+        marker = path / ".complete"
+        if marker.exists():
+            return toolchain
+
+        shutil.rmtree(path, ignore_errors=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        label = f"toolchain@{nuitka_ref[:12]}"
+        result = run_command_in_subprocess(
+            ["uv", "venv", "--python", str(python), str(path)], label=label
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Failed to create toolchain at {path}: {result.output_tail}"
+            )
+        if self.wheelhouse is not None:
+            sources = [*self.wheelhouse.install_args(), "nuitka"]
+        else:
+            sources = [f"git+{self.repository}@{nuitka_ref}"]
+        result = run_command_in_subprocess(
+            [
+                "uv",
+                "pip",
+                "install",
+                "--python",
+                str(toolchain.python),
+                *TOOLCHAIN_PACKAGES,
+                *sources,
+            ],
+            label=label,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Failed to install Nuitka {nuitka_ref} into {path}: "
+                f"{result.output_tail}"
+            )
+        marker.write_text(f"{nuitka_ref}\n{python_version}\n")
+        return toolchain
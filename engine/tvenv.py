@@ -1,110 +1,428 @@
 from pathlib import Path
 import json
+import random
 
-from engine.utils import (
-    temporary_directory_change,
-    run_command_in_subprocess,
-    console,
-)
+from engine.utils import run_command_in_subprocess, console
 from rich.table import Table
 from rich.panel import Panel
+from rich.markup import escape
 from rich import box
 from typing import Any
-from engine.benchmark_prepare import prepare_benchmark_file
+from engine.cache import (
+    ARTIFACT_NAMES,
+    ArtifactCache,
+    CompilerCacheStats,
+    cache_policy_options,
+    compute_cache_key,
+)
+from engine.toolchain import Toolchains, interpreter_version
+from engine.wheelhouse import Wheelhouse
+from engine.matrix import BuildConfig
+from engine.compile_report import REPORT_NAME, PhaseTimer, parse_compilation_report
+from engine.timings import (
+    STARTUP_PROBES,
+    TIMINGS_FD,
+    TIMINGS_FILES,
+    load_timing_reports,
+    probe_env,
+    split_startup,
+    summarize_in_process,
+    timings_env,
+)
+from engine.stats import (
+    SamplingPolicy,
+    bootstrap_ratio_interval,
+    describe_samples,
+    detect_drift,
+    mann_whitney_p_value,
+    ratio_confidence_interval,
+)
+from engine.host import HostMonitor, quality_issues
+from engine.resources import format_bytes, summarize_cpu, summarize_footprint
+from engine.runner import ProcessRunner, RunSample, pinned
+from engine.scaling import fit_scaling
+from engine.benchmark_prepare import (
+    WORKLOAD_SCALE_ENV,
+    scaled_size,
+    size_parameters,
+    workload_size,
+)
+from engine.staging import DEFAULT_BUILD_ROOT, remove_stage, stage_benchmark
+
+
+# Relative change of run time per run above which drift is highlighted.
+DRIFT_WARNING = 0.001
 
 
 class Benchmark:
-    def __init__(self, benchmark_path: Path):
+    def __init__(
+        self,
+        benchmark_path: Path,
+        cache: ArtifactCache | None = None,
+        toolchains: Toolchains | None = None,
+        wheelhouse: Wheelhouse | None = None,
+        build_root: Path = DEFAULT_BUILD_ROOT,
+        config: BuildConfig | None = None,
+        cache_policy: str = "cold",
+        nuitka_cache_dir: Path | None = None,
+    ):
         self.benchmark_path = benchmark_path
-        self.run_benchmark_path = benchmark_path / "run_benchmark.py"
+        self.config = config or BuildConfig()
+        self.cache_policy = cache_policy
+        self.nuitka_cache_dir = nuitka_cache_dir
         self.requirements_path = benchmark_path / "requirements.txt"
         self.requirements_exist = self.requirements_path.exists()
-        self.original_contents = None
-
-    def prepare(self):
-        self.original_contents = self.run_benchmark_path.read_text()
-        prepare_benchmark_file(self.benchmark_path)
-
-    def restore(self):
-        if self.original_contents:
-            with self.run_benchmark_path.open("w") as f:
-                f.write(self.original_contents)
-
-    def compile(self) -> None:
-        self.prepare()
+        self.build_root = build_root
+        self.build_path: Path | None = None
+        self.cache = cache
+        self.wheelhouse = wheelhouse
+        self.toolchains = toolchains or Toolchains(wheelhouse=wheelhouse)
+        self.cache_hit = False
+        self.build_info: dict[str, Any] = {"cache_hit": False, "resources": {}}
+        self.warmup_runs = 0
+
+    def stage(self) -> Path:
+        if self.build_path is None:
+            self.build_path = stage_benchmark(
+                self.benchmark_path, self.build_root, self.config.name
+            )
+        return self.build_path
+
+    def cleanup(self) -> None:
+        if self.build_path is not None:
+            remove_stage(self.build_path)
+            self.build_path = None
+
+    @property
+    def label(self) -> str:
+        if self.config == BuildConfig():
+            return self.benchmark_path.name
+        return f"{self.benchmark_path.name} ({self.config.name})"
+
+    @property
+    def binary_size(self) -> int:
+        return sum(
+            (self.build_path / name).stat().st_size
+            for name in ARTIFACT_NAMES
+            if (self.build_path / name).exists()
+        )
 
-        try:
-            with temporary_directory_change(self.benchmark_path):
-                run_command_in_subprocess(["uv", "venv"])
+    @property
+    def executable(self) -> str:
+        if (self.build_path / "run_benchmark.sh").exists():
+            return "./run_benchmark.sh"
+        return "./run_benchmark.bin"
+
+    @property
+    def python(self) -> Path:
+        return self.build_path / ".venv" / "bin" / "python"
+
+    @property
+    def installed_requirements(self) -> Path:
+        """The requirements file that actually gets installed into the venv."""
+        if self.wheelhouse is not None:
+            return self.wheelhouse.requirements_for(self.benchmark_path.name)
+        return self.requirements_path
+
+    def cache_key(self) -> str:
+        return compute_cache_key(
+            self.build_path / "run_benchmark.py",
+            self.installed_requirements,
+            self.toolchains.resolve(self.config.ref),
+            interpreter_version(self.python),
+            self.config.flags,
+            self.build_path,
+        )
 
-                run_command_in_subprocess(
+    def _run_step(self, step: str, command: list[str], **kwargs: Any):
+        result = run_command_in_subprocess(
+            command, cwd=self.build_path, label=self.label, **kwargs
+        )
+        if result.resources is not None:
+            self.build_info["resources"][step] = result.resources.as_dict()
+        if result.tools:
+            self.build_info["tools"] = result.tools
+        return result
+
+    def compile(self, jobs: int | None = None) -> None:
+        cwd = self.stage()
+        self.build_info = {
+            "cache_hit": False,
+            "cache_policy": self.cache_policy,
+            "resources": {},
+        }
+        self._run_step("venv", ["uv", "venv"])
+
+        key = self.cache_key() if self.cache else None
+        self.cache_hit = key is not None and self.cache.restore(key, cwd)
+        self.build_info["cache_hit"] = self.cache_hit
+        if self.cache_hit:
+            console.print(f"{self.label}: using cached binary {key[:12]}", markup=False)
+
+        # The CPython baseline runs from this venv too, so it only gets the
+        # benchmark's own requirements; Nuitka lives in the shared toolchain.
+        if self.wheelhouse is not None:
+            locked = self.installed_requirements
+            if locked.read_text().strip():
+                self._run_step(
+                    "requirements",
                     [
                         "uv",
                         "pip",
                         "install",
-                        "wheel",
-                        "setuptools",
-                        "git+https://github.com/KRRT7/Nuitka@thin-flto",
-                    ]
-                )
-                if self.requirements_exist:
-                    run_command_in_subprocess(
-                        ["uv", "pip", "install", "-r", "requirements.txt"]
+                        *self.wheelhouse.install_args(),
+                        "-r",
+                        str(locked),
+                    ],
+                )
+        elif self.requirements_exist:
+            self._run_step(
+                "requirements", ["uv", "pip", "install", "-r", "requirements.txt"]
+            )
+        if self.cache_hit:
+            self.build_info["binary_size"] = self.binary_size
+            return
+
+        toolchain = self.toolchains.get(self.python, self.config.ref)
+        cache_flags, cache_env = cache_policy_options(
+            self.cache_policy, self.nuitka_cache_dir
+        )
+        command = [str(self.python), "-m", "nuitka", *self.config.flags, *cache_flags]
+        if jobs is not None:
+            command.append(f"--jobs={jobs}")
+        command += [f"--report={REPORT_NAME}", "run_benchmark.py"]
+        phase_timer = PhaseTimer()
+        compiler_cache = CompilerCacheStats()
+
+        def on_line(line: str) -> None:
+            phase_timer(line)
+            compiler_cache(line)
+
+        result = self._run_step(
+            "nuitka",
+            command,
+            env={**toolchain.env(), **cache_env},
+            on_line=on_line,
+            sample_tree=True,
+        )
+        self.build_info["phases"] = phase_timer.finish()
+        self.build_info["compiler_cache"] = compiler_cache.as_dict()
+        if (cwd / REPORT_NAME).exists():
+            self.build_info["report"] = parse_compilation_report(cwd / REPORT_NAME)
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to compile benchmark: {result.output_tail}")
+
+        self.build_info["binary_size"] = self.binary_size
+        if key is not None:
+            self.cache.store(key, cwd)
+
+    def _measure(
+        self,
+        runner: ProcessRunner,
+        commands: dict[str, str],
+        runs: int,
+        warmup: int,
+    ) -> dict[str, list[RunSample]]:
+        return {
+            variant: runner.run(
+                command,
+                runs,
+                warmup,
+                fds={TIMINGS_FD: self.build_path / TIMINGS_FILES[variant]},
+            )
+            for variant, command in commands.items()
+        }
+
+    def run(
+        self,
+        sampling: SamplingPolicy | None = None,
+        cpus: list[int] | None = None,
+        scale: float | None = None,
+    ) -> dict[str, Any]:
+        sampling = sampling or SamplingPolicy()
+        self.warmup_runs = sampling.warmup
+        for name in TIMINGS_FILES.values():
+            (self.build_path / name).unlink(missing_ok=True)
+
+        commands = {
+            "python": ".venv/bin/python run_benchmark.py",
+            "nuitka": self.executable,
+        }
+        env = timings_env()
+        if scale is not None:
+            env[WORKLOAD_SCALE_ENV] = str(scale)
+        runner = ProcessRunner(self.build_path, env=env)
+        samples: dict[str, list[RunSample]] = {variant: [] for variant in commands}
+        times: dict[str, list[float]] = {variant: [] for variant in commands}
+        warmup = sampling.warmup
+        interval = None
+        rng = random.Random(self.label)
+
+        monitor = HostMonitor(cpus)
+        monitor.sample()
+        with pinned(cpus):
+            # Sample in batches until the speedup ratio is known precisely
+            # enough, instead of spending a fixed number of runs on every
+            # benchmark. Within a batch, CPython and Nuitka take turns in
+            # small blocks so that thermal and frequency drift hits both.
+            while runs := sampling.next_batch(len(times["python"])):
+                for block_runs, order in sampling.blocks(runs, rng):
+                    block = self._measure(
+                        runner,
+                        {variant: commands[variant] for variant in order},
+                        block_runs,
+                        warmup,
                     )
+                    warmup = 0
+                    for variant, runs_samples in block.items():
+                        samples[variant] += runs_samples
+                        times[variant] += [sample.wall_time for sample in runs_samples]
+
+                monitor.sample()
+                interval = ratio_confidence_interval(
+                    times["python"], times["nuitka"], sampling.confidence
+                )
+                console.print(
+                    f"{self.label}: {len(times['python'])} runs, speedup "
+                    f"{interval.ratio:.3f}x "
+                    f"[{interval.low:.3f}, {interval.high:.3f}]",
+                    markup=False,
+                )
+                if (
+                    len(times["python"]) >= sampling.min_runs
+                    and interval.relative_width <= sampling.ci_target
+                ):
+                    break
+
+            # The same commands exiting before the benchmark code and right
+            # after its imports tell how much of the wall time is not the
+            # workload.
+            probes = {
+                (variant, probe): runner.run(
+                    command, sampling.min_runs, 1, env=probe_env(probe)
+                )
+                for variant, command in commands.items()
+                for probe in STARTUP_PROBES
+            }
 
-                command = ["uvx", "--with", "setuptools", "--with", "wheel"]
-                if self.requirements_exist:
-                    command += [
-                        "--with-requirements",
-                        self.requirements_path.as_posix(),
-                    ]
-
-                command += [
-                    "nuitka",
-                    "--lto=yes",
-                    "--remove-output",
-                    "--assume-yes-for-downloads",
-                    "--clang",
-                    "--disable-cache=all",
-                    "--pgo-python",
-                    # "--run",
-                    "run_benchmark.py",
-                ]
-                result = run_command_in_subprocess(command)
-                if result.returncode != 0:
-                    raise RuntimeError(f"Failed to compile benchmark: {result.stderr}")
-        finally:
-            self.restore()
-
-    def run(self, iters: str = "100") -> None:
-        with temporary_directory_change(self.benchmark_path):
-            executable = (
-                "./run_benchmark.sh"
-                if (self.benchmark_path / "run_benchmark.sh").exists()
-                else "./run_benchmark.bin"
-            )
-            command = [
-                "hyperfine",
-                "--show-output",
-                "--warmup",
-                iters,
-                "--runs",
-                iters,
-                "--export-json",
-                "benchmark_results.json",
-                ".venv/bin/python run_benchmark.py",
-                executable,
-            ]
-            result = run_command_in_subprocess(command)
-            if result.returncode != 0:
-                raise RuntimeError(f"Failed to run benchmark: {result.stderr}")
-
-    def execute(self, iters: str = "100") -> None:
+        results = {
+            "results": [
+                {
+                    "command": commands[variant],
+                    "times": times[variant],
+                    "rusage": [sample.usage.as_dict() for sample in runs_samples],
+                    "sched": [
+                        sample.sched.as_dict() if sample.sched else None
+                        for sample in runs_samples
+                    ],
+                }
+                | describe_samples(times[variant])
+                for variant, runs_samples in samples.items()
+            ],
+            "sampling": {
+                "runs": len(times["python"]),
+                "warmup": sampling.warmup,
+                "confidence": sampling.confidence,
+                "ratio_low": interval.low,
+                "ratio_high": interval.high,
+                "converged": interval.relative_width <= sampling.ci_target,
+                "interleave": sampling.interleave,
+                "cpus": cpus,
+                "drift": detect_drift(times["python"], times["nuitka"]),
+            },
+            "startup_probe": {
+                variant: {
+                    probe: describe_samples(
+                        [sample.wall_time for sample in probes[variant, probe]]
+                    )
+                    for probe in STARTUP_PROBES
+                }
+                for variant in commands
+            },
+            "host": monitor.fingerprint(),
+        }
+        (self.build_path / "benchmark_results.json").write_text(json.dumps(results))
+        return results
+
+    @property
+    def sizable(self) -> bool:
+        return self.benchmark_path.name in size_parameters
+
+    def sweep(
+        self,
+        scales: list[float],
+        sampling: SamplingPolicy | None = None,
+        cpus: list[int] | None = None,
+    ) -> dict[str, Any]:
+        """Measure both variants over the workload scales and fit the scaling.
+
+        Scales that round to a data size already covered are skipped, since
+        they would only measure the same point again. Points are the
+        in-process compute time, since interpreter startup and imports do not
+        grow with the data and would flatten the fitted exponents. A scale
+        that fails to run ends the sweep with its error, keeping the points
+        measured so far.
+        """
+        default_size = workload_size(self.benchmark_path)
+        sizes = set()
+        points = []
+        error = None
+        for scale in scales:
+            if default_size is not None:
+                size = scaled_size(default_size, scale)
+                if size in sizes:
+                    console.print(
+                        f"{self.label}: {scale:g}x is size {size} again, skipped",
+                        markup=False,
+                    )
+                    continue
+                sizes.add(size)
+            console.rule(f"Sweeping {self.label} at {scale:g}x workload")
+            try:
+                results = self.run(sampling, cpus, scale=scale)
+            except Exception as e:
+                console.print(
+                    f"[bold red]Failed[/bold red] {escape(self.label)} "
+                    f"at {scale:g}x: {escape(str(e))}"
+                )
+                error = str(e)
+                break
+            compute = {}
+            for variant, data in zip(("python", "nuitka"), results["results"]):
+                reports = load_timing_reports(
+                    self.build_path / TIMINGS_FILES[variant], skip=self.warmup_runs
+                )
+                in_process = summarize_in_process(reports)
+                compute[variant] = (
+                    in_process["compute_mean"] if in_process else data["mean"]
+                )
+            points.append(
+                {
+                    "scale": scale,
+                    "size": reports[0]["size"] if reports else scale,
+                    "python": compute["python"],
+                    "nuitka": compute["nuitka"],
+                    "speedup": compute["python"] / compute["nuitka"],
+                }
+            )
+        return {
+            "benchmark_name": self.benchmark_path.name,
+            "config": self.config.name,
+            "label": self.label,
+            "points": points,
+            "fit": fit_scaling(points),
+            "error": error,
+        }
+
+    def execute(self, sampling: SamplingPolicy | None = None) -> None:
         self.compile()
-        self.run(iters)
+        self.run(sampling)
+
+    def raw_results(self) -> dict[str, Any]:
+        return json.loads((self.build_path / "benchmark_results.json").read_text())
 
-    def report(self) -> dict[str, Any]:
-        results_path = self.benchmark_path / "benchmark_results.json"
+    def report(self, quality_gate: str = "warn") -> dict[str, Any]:
+        results_path = self.build_path / "benchmark_results.json"
 
         if not results_path.exists():
             console.print(
@@ -142,6 +460,9 @@ class Benchmark:
 
             summary = {
                 "benchmark_name": self.benchmark_path.name,
+                "config": self.config.name,
+                "build": self.build_info,
+                "sampling": data.get("sampling"),
                 "python": {
                     "mean": python_mean,
                     "median": python_data["median"],
@@ -163,6 +484,95 @@ class Benchmark:
                 },
             }
 
+            # The raw samples give an interval for the ratio that does not
+            # rely on normality, and a rank test that does not care about
+            # outliers. Only when the interval excludes 1.0 is there a winner.
+            if python_data.get("times") and nuitka_data.get("times"):
+                confidence = (data.get("sampling") or {}).get("confidence", 0.95)
+                interval = bootstrap_ratio_interval(
+                    python_data["times"],
+                    nuitka_data["times"],
+                    confidence,
+                    rng=random.Random(self.label),
+                )
+                summary["comparison"].update(
+                    confidence=confidence,
+                    bootstrap_low=interval.low,
+                    bootstrap_high=interval.high,
+                    p_value=mann_whitney_p_value(
+                        python_data["times"], nuitka_data["times"]
+                    ),
+                    significant=not interval.low <= 1.0 <= interval.high,
+                )
+
+            # Both variants are judged on the statement CPython spends its
+            # time in, so the steady-state speedup compares like with like.
+            workload = None
+            for variant in ("python", "nuitka"):
+                reports = load_timing_reports(
+                    self.build_path / TIMINGS_FILES[variant], skip=self.warmup_runs
+                )
+                in_process = summarize_in_process(reports, workload)
+                summary[variant]["in_process"] = in_process
+                if in_process:
+                    workload = in_process["workload"]
+
+            probes = data.get("startup_probe")
+            if probes:
+                for variant in ("python", "nuitka"):
+                    summary[variant]["startup"] = split_startup(
+                        summary[variant]["mean"],
+                        {
+                            probe: probes[variant][probe]["mean"]
+                            for probe in STARTUP_PROBES
+                        },
+                    )
+
+            for variant, variant_data in (
+                ("python", python_data),
+                ("nuitka", nuitka_data),
+            ):
+                summary[variant]["memory"] = summarize_footprint(
+                    variant_data.get("rusage", [])
+                )
+                summary[variant]["cpu"] = summarize_cpu(
+                    variant_data.get("rusage", []), variant_data.get("sched", [])
+                )
+            python_memory = summary["python"]["memory"]
+            nuitka_memory = summary["nuitka"]["memory"]
+            if python_memory and nuitka_memory:
+                summary["comparison"]["memory_ratio"] = (
+                    nuitka_memory["peak_rss"] / python_memory["peak_rss"]
+                    if python_memory["peak_rss"] > 0
+                    else float("inf")
+                )
+
+            python_in_process = summary["python"]["in_process"]
+            nuitka_in_process = summary["nuitka"]["in_process"]
+            if python_in_process and nuitka_in_process:
+                summary["comparison"]["steady_state_speedup"] = (
+                    python_in_process["iteration_mean"]
+                    / nuitka_in_process["iteration_mean"]
+                    if nuitka_in_process["iteration_mean"] > 0
+                    else float("inf")
+                )
+
+            host = data.get("host")
+            if host:
+                summary["host"] = host
+                if quality_gate != "off":
+                    summary["quality"] = quality_issues(host)
+                    noise = summary["quality"]["noise"]
+                    if noise and quality_gate == "refuse":
+                        console.print(
+                            f"[bold red]Refused:[/bold red] {self.label} was measured "
+                            f"on a noisy host ({', '.join(noise)})"
+                        )
+                        return {
+                            "error": f"Refused noisy measurement: {', '.join(noise)}",
+                            "host": host,
+                        }
+
             self._display_report(summary)
             return summary
 
@@ -191,10 +601,14 @@ class Benchmark:
         nuitka_data = summary["nuitka"]
         comparison = summary["comparison"]
 
+        significant = comparison.get("significant", True)
         speedup = f"{comparison['speedup_ratio']:.2f}x"
-        speedup_style = (
-            "[bold green]" if comparison["is_nuitka_faster"] else "[bold red]"
-        )
+        if not significant:
+            speedup_style = "[bold yellow]"
+        elif comparison["is_nuitka_faster"]:
+            speedup_style = "[bold green]"
+        else:
+            speedup_style = "[bold red]"
 
         table.add_row(
             "Mean Execution Time",
@@ -224,23 +638,201 @@ class Benchmark:
             "",
         )
 
+        python_startup = python_data.get("startup")
+        nuitka_startup = nuitka_data.get("startup")
+        if python_startup and nuitka_startup:
+            for part, label in (
+                ("startup", "Startup Time"),
+                ("imports", "Import Time"),
+                ("compute", "Compute Time"),
+            ):
+                difference = ""
+                # Parts lost in the noise of the probes have no meaningful ratio.
+                if python_startup[part] > 0 and nuitka_startup[part] > 0:
+                    ratio = python_startup[part] / nuitka_startup[part]
+                    style = "[bold green]" if ratio > 1 else "[bold red]"
+                    difference = f"{style}{ratio:.2f}x[/]"
+                table.add_row(
+                    label,
+                    format_time(python_startup[part]),
+                    format_time(nuitka_startup[part]),
+                    difference,
+                )
+
+        python_in_process = python_data.get("in_process")
+        nuitka_in_process = nuitka_data.get("in_process")
+        if python_in_process and nuitka_in_process:
+            steady_speedup = comparison["steady_state_speedup"]
+            steady_style = "[bold green]" if steady_speedup > 1 else "[bold red]"
+            table.add_row(
+                "In-Process Compute Time",
+                format_time(python_in_process["compute_mean"]),
+                format_time(nuitka_in_process["compute_mean"]),
+                "",
+            )
+            table.add_row(
+                "Steady-State Iteration",
+                format_time(python_in_process["iteration_mean"]),
+                format_time(nuitka_in_process["iteration_mean"]),
+                f"{steady_style}{steady_speedup:.2f}x[/]",
+            )
+            table.add_row(
+                "Throughput",
+                f"{python_in_process['throughput']:.2f} iter/s",
+                f"{nuitka_in_process['throughput']:.2f} iter/s",
+                "",
+            )
+            python_sites = python_in_process.get("sites") or {}
+            nuitka_sites = nuitka_in_process.get("sites") or {}
+            if len(python_sites) > 1:
+                for site, python_site in python_sites.items():
+                    nuitka_site = nuitka_sites.get(site)
+                    if nuitka_site is None:
+                        continue
+                    ratio = (
+                        python_site["mean"] / nuitka_site["mean"]
+                        if nuitka_site["mean"] > 0
+                        else float("inf")
+                    )
+                    style = "[green]" if ratio > 1 else "[red]"
+                    table.add_row(
+                        f"  {escape(site)}",
+                        format_time(python_site["mean"]),
+                        format_time(nuitka_site["mean"]),
+                        f"{style}{ratio:.2f}x[/]",
+                    )
+
+        python_cpu = python_data.get("cpu")
+        nuitka_cpu = nuitka_data.get("cpu")
+        if python_cpu and nuitka_cpu:
+            table.add_row(
+                "CPU Time",
+                format_time(python_cpu["cpu_time"]),
+                format_time(nuitka_cpu["cpu_time"]),
+                "",
+            )
+            if "children_cpu_time" in python_cpu and "children_cpu_time" in nuitka_cpu:
+                # wait4 counts reaped children in the CPU time already, and
+                # schedstat of an exited process only has its main thread.
+                table.add_row(
+                    "  of which Child Processes",
+                    format_time(python_cpu["children_cpu_time"]),
+                    format_time(nuitka_cpu["children_cpu_time"]),
+                    "",
+                )
+                table.add_row(
+                    "Run-Queue Wait (Main Thread)",
+                    format_time(python_cpu["run_delay"]),
+                    format_time(nuitka_cpu["run_delay"]),
+                    "",
+                )
+            table.add_row(
+                "CPU Efficiency",
+                f"{python_cpu['efficiency']:.2f}",
+                f"{nuitka_cpu['efficiency']:.2f}",
+                "",
+            )
+
+        python_memory = python_data.get("memory")
+        nuitka_memory = nuitka_data.get("memory")
+        if python_memory and nuitka_memory:
+            memory_ratio = comparison["memory_ratio"]
+            memory_style = "[bold green]" if memory_ratio < 1 else "[bold red]"
+            table.add_row(
+                "Peak RSS",
+                format_bytes(python_memory["peak_rss"]),
+                format_bytes(nuitka_memory["peak_rss"]),
+                f"{memory_style}{memory_ratio - 1:+.1%}[/]",
+            )
+            table.add_row(
+                "Page Faults (minor/major)",
+                f"{python_memory['minor_faults']:.0f} / "
+                f"{python_memory['major_faults']:.0f}",
+                f"{nuitka_memory['minor_faults']:.0f} / "
+                f"{nuitka_memory['major_faults']:.0f}",
+                "",
+            )
+            table.add_row(
+                "Context Switches (vol/invol)",
+                f"{python_memory['voluntary_switches']:.0f} / "
+                f"{python_memory['involuntary_switches']:.0f}",
+                f"{nuitka_memory['voluntary_switches']:.0f} / "
+                f"{nuitka_memory['involuntary_switches']:.0f}",
+                "",
+            )
+
+        if "bootstrap_low" in comparison:
+            table.add_row(
+                f"Speedup {comparison['confidence']:.0%} CI (bootstrap)",
+                "",
+                "",
+                f"{comparison['bootstrap_low']:.3f}x - "
+                f"{comparison['bootstrap_high']:.3f}x",
+            )
+            table.add_row("Rank Test p-value", "", "", f"{comparison['p_value']:.4f}")
+
         percent_change = comparison["percent_change"]
         percent_str = f"{percent_change:.2f}%"
-        percent_style = "[bold green]" if percent_change > 0 else "[bold red]"
+        if significant:
+            percent_style = "[bold green]" if percent_change > 0 else "[bold red]"
+        else:
+            percent_style = "[bold yellow]"
+            percent_str += " (no significant difference)"
         table.add_row(
             "Performance Improvement", "", "", f"{percent_style}{percent_str}[/]"
         )
 
         console.print(table)
 
-        status = (
-            "[bold green]FASTER[/bold green]"
-            if comparison["is_nuitka_faster"]
-            else "[bold red]SLOWER[/bold red]"
-        )
-        summary_text = (
-            f"Nuitka compilation is {status} than CPython by {abs(percent_change):.2f}%"
-        )
+        if not significant:
+            summary_text = (
+                "[bold yellow]No significant difference[/bold yellow] between "
+                f"Nuitka and CPython ({percent_change:+.2f}%, "
+                f"rank test p={comparison['p_value']:.3f})"
+            )
+        else:
+            status = (
+                "[bold green]FASTER[/bold green]"
+                if comparison["is_nuitka_faster"]
+                else "[bold red]SLOWER[/bold red]"
+            )
+            summary_text = (
+                f"Nuitka compilation is {status} than CPython by "
+                f"{abs(percent_change):.2f}%"
+            )
+        sampling = summary.get("sampling")
+        if sampling:
+            summary_text += (
+                f"\n{sampling['runs']} runs, {sampling['confidence']:.0%} CI of speedup "
+                f"[{sampling['ratio_low']:.3f}x, {sampling['ratio_high']:.3f}x]"
+            )
+            if not sampling["converged"]:
+                summary_text += " [yellow](did not converge)[/yellow]"
+            drift = sampling.get("drift")
+            if drift:
+                drift_style = (
+                    "[yellow]"
+                    if max(abs(drift["python_trend"]), abs(drift["nuitka_trend"]))
+                    > DRIFT_WARNING
+                    else ""
+                )
+                summary_text += (
+                    f"\n{drift_style}Drift per run: CPython "
+                    f"{drift['python_trend']:+.3%}, Nuitka {drift['nuitka_trend']:+.3%}; "
+                    f"speedup {drift['ratio_first_half']:.3f}x -> "
+                    f"{drift['ratio_second_half']:.3f}x between halves"
+                    f"{'[/yellow]' if drift_style else ''}"
+                )
+        quality = summary.get("quality")
+        if quality:
+            if quality["noise"]:
+                summary_text += (
+                    f"\n[yellow]Noisy host: {', '.join(quality['noise'])}[/yellow]"
+                )
+            if quality["settings"]:
+                summary_text += (
+                    f"\n[dim]Host settings: {', '.join(quality['settings'])}[/dim]"
+                )
         console.print(
             Panel(
                 summary_text,
@@ -1,3 +1,4 @@
+import collections
 import contextlib
 import errno
 import os
@@ -10,7 +11,8 @@ from typing import Any, Callable, Iterator
 import subprocess
 import sys
 from rich.console import Console
-from argparse import ArgumentParser, Namespace
+from engine.resources import ProcessTreeSampler, ResourceUsage
+from argparse import SUPPRESS, ArgumentParser, ArgumentTypeError, Namespace
 
 
 console = Console()
@@ -117,30 +119,79 @@ def _get_envvars():
     return env
 
 
+# Lines of the merged stdout and stderr of a command kept for error messages.
+OUTPUT_TAIL_LINES = 20
+
+
+class CommandResult(subprocess.CompletedProcess):
+    def __init__(
+        self,
+        args: list[str],
+        returncode: int,
+        output_tail: str = "",
+        resources: ResourceUsage | None = None,
+        tools: dict[str, dict[str, float]] | None = None,
+    ):
+        super().__init__(args=args, returncode=returncode)
+        self.output_tail = output_tail
+        self.resources = resources
+        self.tools = tools
+
+
 def run_command_in_subprocess(
     command: list[str],
-) -> subprocess.CompletedProcess:
+    cwd: Path | None = None,
+    label: str | None = None,
+    env: dict[str, str] | None = None,
+    on_line: Callable[[str], None] | None = None,
+    sample_tree: bool = False,
+) -> CommandResult:
+    start = perf_counter()
     process = subprocess.Popen(
         command,
-        env=_get_envvars(),
+        cwd=cwd,
+        env={**_get_envvars(), **(env or {})},
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
         bufsize=1,
     )
 
-    while True:
-        output = process.stdout.readline()
-        if output == "" and process.poll() is not None:
-            break
-        if output:
-            console.print(output.strip())
-
-    returncode = process.wait()
-
-    return subprocess.CompletedProcess(
+    sampler = None
+    if sample_tree and ProcessTreeSampler.available():
+        sampler = ProcessTreeSampler(process.pid)
+
+    tail: collections.deque[str] = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    with sampler or contextlib.nullcontext():
+        while True:
+            output = process.stdout.readline()
+            if output == "":
+                break
+            tail.append(output)
+            if on_line is not None:
+                on_line(output)
+            if label:
+                console.print(f"{label}: {output.strip()}", markup=False)
+            else:
+                console.print(output.strip())
+
+        resources = None
+        if hasattr(os, "wait4"):
+            # wait4 reports the rusage of the child and every descendant it
+            # waited for, so this covers the whole process tree.
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            resources = ResourceUsage.from_rusage(rusage, perf_counter() - start)
+        else:
+            process.wait()
+        process.stdout.close()
+
+    return CommandResult(
         args=command,
-        returncode=returncode,
+        returncode=process.returncode,
+        output_tail="".join(tail).strip(),
+        resources=resources,
+        tools=sampler.by_tool() if sampler else None,
     )
 
 
@@ -180,8 +231,129 @@ def get_benchmarks(bechmark_dir: Path) -> Iterator[Path]:
         yield benchmark_case
 
 
+def _absolute_path(value: str) -> Path:
+    # See engine/runner.py for why every path has to be absolute.
+    return Path(value).resolve()
+
+
+def _add_wheelhouse_argument(parser: ArgumentParser, **kwargs: Any) -> None:
+    parser.add_argument(
+        "--wheelhouse",
+        type=_absolute_path,
+        help="Directory holding prefetched wheels and their lockfile",
+        **kwargs,
+    )
+
+
+def _add_cache_dir_argument(parser: ArgumentParser, **kwargs: Any) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        type=_absolute_path,
+        help="Directory for cached compiled binaries",
+        **kwargs,
+    )
+
+
+def _add_results_db_argument(parser: ArgumentParser, **kwargs: Any) -> None:
+    parser.add_argument(
+        "--results-db",
+        type=_absolute_path,
+        help="SQLite database every result is recorded in "
+        "(default: results.sqlite in the cache directory)",
+        **kwargs,
+    )
+
+
+def _matrix_axis(spec: str) -> tuple[str, list[str]]:
+    from engine.matrix import parse_axis
+
+    try:
+        return parse_axis(spec)
+    except ValueError as e:
+        raise ArgumentTypeError(str(e))
+
+
+def _workload_scales(spec: str) -> list[float]:
+    from engine.scaling import parse_scales
+
+    try:
+        return parse_scales(spec)
+    except ValueError as e:
+        raise ArgumentTypeError(str(e))
+
+
 def parse_args() -> Namespace:
+    from engine.cache import CACHE_POLICIES
+    from engine.scaling import DEFAULT_SCALES
+
     parser = ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command")
+
+    prefetch = subparsers.add_parser(
+        "prefetch",
+        help="Download Nuitka and all benchmark requirements into a wheelhouse",
+    )
+    prefetch.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=SUPPRESS,
+        help="Prefetch only the specified benchmarks",
+    )
+    _add_wheelhouse_argument(prefetch, default=SUPPRESS)
+
+    regressions = subparsers.add_parser(
+        "regressions",
+        help="Find the first run of each benchmark where it got significantly slower",
+    )
+    regressions.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=SUPPRESS,
+        help="Check only the specified benchmarks",
+    )
+    _add_cache_dir_argument(regressions, default=SUPPRESS)
+    _add_results_db_argument(regressions, default=SUPPRESS)
+    regressions.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="Significance level of the change-point tests",
+    )
+    regressions.add_argument(
+        "--min-effect",
+        type=float,
+        default=0.02,
+        help="Smallest relative slowdown worth reporting",
+    )
+
+    compare = subparsers.add_parser(
+        "compare",
+        help="Compare two stored suite runs or Nuitka refs benchmark by benchmark",
+    )
+    compare.add_argument(
+        "baseline", help="Suite run ID or Nuitka ref to compare against"
+    )
+    compare.add_argument("candidate", help="Suite run ID or Nuitka ref to compare")
+    _add_cache_dir_argument(compare, default=SUPPRESS)
+    _add_results_db_argument(compare, default=SUPPRESS)
+    compare.add_argument(
+        "--sort",
+        choices=["name", "delta"],
+        default="name",
+        help="Order benchmarks by name or by the change of the Nuitka time",
+    )
+    compare.add_argument(
+        "--tags",
+        nargs="+",
+        help="Compare only benchmarks with any of these pyperformance tags",
+    )
+    compare.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="Significance level for marking a change",
+    )
+
     parser.add_argument(
         "--clean", action="store_true", help="Clean up compiled benchmarks"
     )
@@ -190,4 +362,129 @@ def parse_args() -> Namespace:
         nargs="+",
         help="Run only the specified benchmarks",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of benchmarks to compile concurrently (default: derived from CPUs and RAM)",
+    )
+    parser.add_argument(
+        "--compile-jobs",
+        type=int,
+        default=4,
+        help="Number of C compiler jobs Nuitka may use per benchmark",
+    )
+    parser.add_argument(
+        "--build-memory",
+        type=float,
+        default=4.0,
+        help="Expected peak memory of one benchmark build in GiB, used to cap --jobs",
+    )
+    _add_cache_dir_argument(parser)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild binaries instead of reusing cached ones",
+    )
+    parser.add_argument(
+        "--cache-policy",
+        choices=CACHE_POLICIES,
+        default="cold",
+        help="Nuitka compile cache use: cold disables all caches (release runs), "
+        "warm uses Nuitka's per-user caches, shared uses --nuitka-cache-dir",
+    )
+    parser.add_argument(
+        "--nuitka-cache-dir",
+        type=_absolute_path,
+        help="Cache directory shared by all builds with --cache-policy=shared",
+    )
+    parser.add_argument(
+        "--build-dir",
+        type=_absolute_path,
+        help="Scratch directory for staged benchmark builds",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Install Nuitka and requirements only from the prefetched wheelhouse",
+    )
+    _add_wheelhouse_argument(parser)
+    parser.add_argument(
+        "--min-runs",
+        type=int,
+        default=10,
+        help="Minimum number of measured runs per benchmark",
+    )
+    parser.add_argument(
+        "--max-runs",
+        type=int,
+        default=100,
+        help="Maximum number of measured runs per benchmark",
+    )
+    parser.add_argument(
+        "--ci-target",
+        type=float,
+        default=0.02,
+        help="Stop sampling once the confidence interval of the speedup is "
+        "narrower than this fraction of the speedup",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        help="Number of unmeasured warmup runs per benchmark",
+    )
+    parser.add_argument(
+        "--interleave",
+        choices=["random", "alternate", "off"],
+        default="random",
+        help="Order of CPython and Nuitka runs within each sampling batch",
+    )
+    parser.add_argument(
+        "--cpus",
+        help="CPU list (e.g. 2-3) to pin measurements to (default: isolated CPUs)",
+    )
+    parser.add_argument(
+        "--measure-jobs",
+        type=int,
+        default=1,
+        help="Number of benchmarks to measure concurrently on disjoint cores",
+    )
+    _add_results_db_argument(parser)
+    parser.add_argument(
+        "--quality-gate",
+        choices=["off", "warn", "refuse"],
+        default="warn",
+        help="What to do with measurements taken on a noisy host",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Measure benchmarks with a size parameter over a series of "
+        "workload sizes and fit scaling curves",
+    )
+    parser.add_argument(
+        "--sweep-scales",
+        type=_workload_scales,
+        default=list(DEFAULT_SCALES),
+        help="Comma-separated multiples of the default workload size to sweep",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rebuild and re-measure benchmarks whose inputs changed since "
+        "the last run, carrying the other results forward",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=_absolute_path,
+        help="Manifest of benchmark fingerprints and results from previous runs",
+    )
+    parser.add_argument(
+        "--matrix",
+        nargs="+",
+        type=_matrix_axis,
+        metavar="AXIS=V1,V2",
+        help="Build and measure every combination of these Nuitka build options "
+        "(axes: lto=yes,no,auto compiler=clang,gcc pgo=on,off ref=<git refs>)",
+    )
     return parser.parse_args()
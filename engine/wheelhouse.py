@@ -0,0 +1,167 @@
+import hashlib
+import json
+import tempfile
+from pathlib import Path
+
+from engine.cache import DEFAULT_CACHE_DIR
+from engine.toolchain import (
+    NUITKA_REF,
+    NUITKA_REPOSITORY,
+    TOOLCHAIN_PACKAGES,
+    interpreter_version,
+    resolve_git_ref,
+)
+from engine.utils import console, run_command_in_subprocess
+
+DEFAULT_WHEELHOUSE = DEFAULT_CACHE_DIR / "wheelhouse"
+
+LOCKFILE_NAME = "lock.json"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check(result, what: str) -> None:
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to {what}: {result.output_tail}")
+
+
+class Wheelhouse:
+    def __init__(self, path: Path = DEFAULT_WHEELHOUSE):
+        self.path = path
+        self.lockfile = path / LOCKFILE_NAME
+        self.locks_dir = path / "locks"
+        self._lock: dict | None = None
+
+    @property
+    def lock(self) -> dict:
+        if self._lock is None:
+            if not self.lockfile.exists():
+                raise FileNotFoundError(
+                    f"No wheelhouse lockfile at {self.lockfile}, run `main.py prefetch` first"
+                )
+            self._lock = json.loads(self.lockfile.read_text())
+        return self._lock
+
+    @property
+    def nuitka_commit(self) -> str:
+        return self.lock["nuitka"]["commit"]
+
+    def install_args(self) -> list[str]:
+        return ["--offline", "--no-index", "--find-links", str(self.path)]
+
+    def requirements_for(self, benchmark_name: str) -> Path:
+        if benchmark_name not in self.lock["benchmarks"]:
+            raise KeyError(f"{benchmark_name} is not in the wheelhouse lockfile")
+        return self.locks_dir / f"{benchmark_name}.txt"
+
+    def verify(self, python_version: str) -> None:
+        """Check the wheels and that they were locked for ``python_version``.
+
+        Wheels resolved for another interpreter would only make the offline
+        install fail later with an obscure resolver error.
+        """
+        if self.lock["python"] != python_version:
+            raise RuntimeError(
+                f"Wheelhouse was prefetched for Python {self.lock['python']}, "
+                f"but benchmarks would run on {python_version}; "
+                "run `main.py prefetch` again"
+            )
+        for name, expected in self.lock["wheels"].items():
+            wheel = self.path / name
+            if not wheel.exists() or _sha256(wheel) != expected:
+                raise RuntimeError(f"Wheelhouse entry {name} is missing or modified")
+
+    def prefetch(
+        self,
+        benchmark_paths: list[Path],
+        repository: str = NUITKA_REPOSITORY,
+        ref: str = NUITKA_REF,
+    ) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.locks_dir.mkdir(exist_ok=True)
+        commit = resolve_git_ref(repository, ref)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # A seeded venv gives us pip, which unlike uv can build and
+            # download wheels into a directory.
+            venv = Path(tmp) / "venv"
+            _check(
+                run_command_in_subprocess(["uv", "venv", "--seed", str(venv)]),
+                "create the prefetch venv",
+            )
+            python = venv / "bin" / "python"
+            pip_wheel = [
+                str(python),
+                "-m",
+                "pip",
+                "wheel",
+                "--wheel-dir",
+                str(self.path),
+            ]
+
+            console.rule(f"Prefetching Nuitka {ref} @ {commit[:12]}")
+            _check(
+                run_command_in_subprocess(
+                    [*pip_wheel, *TOOLCHAIN_PACKAGES, f"git+{repository}@{commit}"]
+                ),
+                "build the Nuitka wheel",
+            )
+
+            benchmarks = {}
+            for benchmark_path in sorted(benchmark_paths):
+                requirements = benchmark_path / "requirements.txt"
+                locked = self.locks_dir / f"{benchmark_path.name}.txt"
+                if not requirements.exists():
+                    locked.write_text("")
+                    benchmarks[benchmark_path.name] = []
+                    continue
+
+                console.rule(f"Prefetching {benchmark_path.name}")
+                _check(
+                    run_command_in_subprocess(
+                        [
+                            "uv",
+                            "pip",
+                            "compile",
+                            "--python",
+                            str(python),
+                            "--quiet",
+                            str(requirements),
+                            "-o",
+                            str(locked),
+                        ]
+                    ),
+                    f"lock {requirements}",
+                )
+                _check(
+                    run_command_in_subprocess([*pip_wheel, "-r", str(locked)]),
+                    f"download wheels for {benchmark_path.name}",
+                )
+                benchmarks[benchmark_path.name] = [
+                    line
+                    for line in locked.read_text().splitlines()
+                    if line and not line.lstrip().startswith("#")
+                ]
+
+            python_version = interpreter_version(python)
+
+        lock = {
+            "nuitka": {"repository": repository, "ref": ref, "commit": commit},
+            "python": python_version,
+            "benchmarks": benchmarks,
+            "wheels": {
+                wheel.name: _sha256(wheel) for wheel in sorted(self.path.glob("*.whl"))
+            },
+        }
+        self.lockfile.write_text(json.dumps(lock, indent=2) + "\n")
+        self._lock = lock
+        console.print(
+            f"Wheelhouse at {self.path} holds {len(lock['wheels'])} wheels "
+            f"for {len(benchmarks)} benchmarks"
+        )
@@ -1,10 +1,37 @@
 from engine.tvenv import Benchmark
+from engine.cache import DEFAULT_CACHE_DIR, ArtifactCache, display_cache_stats
+from engine.scheduler import (
+    GIB,
+    BuildScheduler,
+    MeasurementScheduler,
+    display_build_times,
+)
 from engine.utils import console, get_benchmarks, clean, parse_args
+from engine.wheelhouse import DEFAULT_WHEELHOUSE, Wheelhouse
+from engine.staging import DEFAULT_BUILD_ROOT
+from engine.matrix import display_matrix, expand_matrix
+from engine.compile_report import display_compile_phases
+from engine.scaling import display_scaling
+from engine.manifest import (
+    MANIFEST_NAME,
+    Manifest,
+    default_python,
+    fingerprint_benchmark,
+)
+from engine.toolchain import Toolchains, interpreter_version
+from engine.stats import SamplingPolicy
+from engine.host import host_identity, host_key
+from engine.results_store import RESULTS_DB_NAME, ResultsStore
+from engine.regressions import display_regressions, find_regressions
+from engine.pinning import format_cpu_list, measurement_cpus
+from engine.compare import compare_results, display_comparison, sort_comparison
+from engine.suite import benchmark_tags, display_suite_summary, suite_summary
 from rich.progress import track
+from argparse import Namespace
 from pathlib import Path
 
 
-def main(benchmarks=None):
+def select_benchmarks(benchmarks=None):
     _benchmarks = list(get_benchmarks(Path.cwd() / "benchmarks"))
     if benchmarks:
         _benchmarks = [
@@ -13,28 +40,220 @@ def main(benchmarks=None):
             if any(benchmark in b.name for benchmark in benchmarks)
         ]
 
-    benchmarks = sorted(_benchmarks)
+    return sorted(_benchmarks)
 
-    for benchmark_path in track(
-        benchmarks,
-        description="Compiling benchmarks",
+
+def prefetch(args: Namespace):
+    wheelhouse = Wheelhouse(args.wheelhouse or DEFAULT_WHEELHOUSE)
+    wheelhouse.prefetch(select_benchmarks(args.benchmarks))
+
+
+def regressions(args: Namespace):
+    cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
+    store = ResultsStore(args.results_db or cache_dir / RESULTS_DB_NAME)
+    try:
+        display_regressions(
+            find_regressions(
+                store, args.benchmarks, alpha=args.alpha, min_effect=args.min_effect
+            )
+        )
+    finally:
+        store.close()
+
+
+def compare(args: Namespace):
+    cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
+    store = ResultsStore(args.results_db or cache_dir / RESULTS_DB_NAME)
+    try:
+        comparison = compare_results(
+            store,
+            args.baseline,
+            args.candidate,
+            only_tags=args.tags,
+            tags={path.name: benchmark_tags(path) for path in select_benchmarks()},
+            alpha=args.alpha,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    finally:
+        store.close()
+    sort_comparison(comparison, args.sort)
+    display_comparison(comparison)
+
+
+def main(args: Namespace):
+    benchmarks = select_benchmarks(args.benchmarks)
+    configs = expand_matrix(args.matrix)
+
+    python_version = interpreter_version(Path(default_python()))
+    wheelhouse = None
+    if args.offline:
+        wheelhouse = Wheelhouse(args.wheelhouse or DEFAULT_WHEELHOUSE)
+        wheelhouse.verify(python_version)
+
+    cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
+    cache = None if args.no_cache else ArtifactCache(cache_dir)
+    toolchains = Toolchains(cache_dir, wheelhouse=wheelhouse)
+    manifest = Manifest(args.manifest or cache_dir / MANIFEST_NAME)
+
+    pending = []
+    fingerprints = {}
+    summaries = []
+    for path in benchmarks:
+        for config in configs:
+            key = Manifest.key(path.name, config.name)
+            fingerprints[key] = fingerprint_benchmark(
+                path, [toolchains.resolve(config.ref), python_version, *config.flags]
+            )
+            previous = manifest.unchanged(key, fingerprints[key])
+            if args.incremental and not args.sweep and previous is not None:
+                summaries.append(previous)
+                continue
+            pending.append(
+                Benchmark(
+                    path,
+                    cache=cache,
+                    toolchains=toolchains,
+                    wheelhouse=wheelhouse,
+                    build_root=args.build_dir or DEFAULT_BUILD_ROOT,
+                    config=config,
+                    cache_policy=args.cache_policy,
+                    nuitka_cache_dir=args.nuitka_cache_dir or cache_dir / "nuitka",
+                )
+            )
+
+    if summaries:
+        console.print(
+            f"Carrying forward {len(summaries)} unchanged results: "
+            + ", ".join(
+                Manifest.key(s["benchmark_name"], s["config"]) for s in summaries
+            ),
+            markup=False,
+        )
+
+    sampling = SamplingPolicy(
+        min_runs=args.min_runs,
+        max_runs=args.max_runs,
+        ci_target=args.ci_target,
+        warmup=args.warmup,
+        interleave=args.interleave,
+    )
+    cpus = measurement_cpus(args.cpus)
+    if cpus:
+        console.print(f"Pinning measurements to CPUs {format_cpu_list(cpus)}")
+    scheduler = BuildScheduler(
+        jobs=args.jobs,
+        compile_jobs=args.compile_jobs,
+        memory_per_build=int(args.build_memory * GIB),
+    )
+    build_results = scheduler.build(pending)
+    built = [result.benchmark for result in build_results if result.ok]
+    for result in build_results:
+        if not result.ok:
+            result.benchmark.cleanup()
+            summaries.append(
+                {
+                    "benchmark_name": result.benchmark.benchmark_path.name,
+                    "config": result.benchmark.config.name,
+                    "error": result.error,
+                }
+            )
+
+    if args.sweep:
+        sweeps = []
+        try:
+            for benchmark in built:
+                if benchmark.sizable:
+                    sweeps.append(benchmark.sweep(args.sweep_scales, sampling, cpus))
+                else:
+                    console.print(
+                        f"{benchmark.label}: no workload size parameter, skipped",
+                        markup=False,
+                    )
+                benchmark.cleanup()
+        finally:
+            for benchmark in built:
+                benchmark.cleanup()
+        display_build_times(build_results)
+        display_scaling(sweeps)
+        return
+
+    store = ResultsStore(args.results_db or cache_dir / RESULTS_DB_NAME)
+    identity = host_identity(cpus)
+    suite_run = store.begin_suite_run(host_key(identity), identity)
+    measurer = MeasurementScheduler(slots=args.measure_jobs, cpus=cpus)
+    for measurement in track(
+        measurer.measure(built, sampling),
+        description="Running benchmarks",
         console=console,
         auto_refresh=False,
-        total=len(benchmarks),
+        total=len(built),
     ):
-        fname = f"{benchmark_path.parent.name}/{benchmark_path.name}"
-        console.rule(f"Compiling {benchmark_path.name} @ {fname}")
-
-        benchmark = Benchmark(benchmark_path)
-        benchmark.execute()
-        benchmark.report()
+        benchmark = measurement.benchmark
+        benchmark_path = benchmark.benchmark_path
+        key = Manifest.key(benchmark_path.name, benchmark.config.name)
+        if not measurement.ok:
+            summaries.append(
+                {
+                    "benchmark_name": benchmark_path.name,
+                    "config": benchmark.config.name,
+                    "error": measurement.error,
+                }
+            )
+            continue
+        try:
+            summary = benchmark.report(args.quality_gate)
+            if "error" not in summary:
+                summary["build"]["cold_build_time"] = manifest.cold_build_time(key)
+                store.record(
+                    suite_run,
+                    summary,
+                    benchmark.raw_results(),
+                    nuitka_ref=toolchains.resolve(benchmark.config.ref),
+                    python_version=python_version,
+                    flags=benchmark.config.flags,
+                    host_key=host_key(identity),
+                )
+        finally:
+            benchmark.cleanup()
+        if "error" in summary:
+            summary.update(
+                benchmark_name=benchmark_path.name, config=benchmark.config.name
+            )
+        else:
+            manifest.update(key, fingerprints[key], summary)
+            manifest.save()
+        summaries.append(summary)
 
-    clean()
+    display_build_times(build_results)
+    display_compile_phases(
+        [(r.benchmark.label, r.benchmark.build_info) for r in build_results]
+    )
+    if args.cache_policy != "cold" or cache is not None:
+        display_cache_stats(summaries)
+    if len(configs) > 1:
+        order = {config.name: i for i, config in enumerate(configs)}
+        summaries.sort(key=lambda s: (s["benchmark_name"], order[s["config"]]))
+        display_matrix(summaries)
+    tags = {path.name: benchmark_tags(path) for path in benchmarks}
+    for config in configs:
+        display_suite_summary(
+            config.name,
+            suite_summary([s for s in summaries if s["config"] == config.name], tags),
+        )
+    store.close()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    if args.clean:
+    if args.command == "prefetch":
+        prefetch(args)
+    elif args.command == "regressions":
+        regressions(args)
+    elif args.command == "compare":
+        compare(args)
+    elif args.clean:
         clean()
     else:
-        main(args.benchmarks if args.benchmarks else None)
+        main(args)